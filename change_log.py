@@ -0,0 +1,144 @@
+"""
+Append-only JSONL log of changes made to the master bucket store.
+
+Every incremental update appends one line per event to
+master_bucket_store/changes.jsonl, each with a monotonically increasing
+sequence number:
+
+    game_inserted   a new game and the bucket it landed in
+    new_uniqorn     a bucket went from 0 to 1 game
+    broken_uniqorn  a bucket that held one game now holds more; carries
+                    the previous Uniqorn game and the games that broke it
+    summary_delta   change in total games / buckets / Uniqorn counts
+
+Consumers keep a cursor (last seen sequence number and byte offset) and
+only read the events after it, instead of diffing full snapshots.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from data_utils import bucket_code_to_str
+from master_bucket_store import STORE_DIR
+
+CHANGE_LOG_FILE = "changes.jsonl"
+
+
+class ChangeLog:
+    """The change log of one store directory."""
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.path = Path(store_dir) / CHANGE_LOG_FILE
+
+    def last_seq(self) -> int:
+        """Sequence number of the last event in the log (0 if empty), read from the file's tail."""
+        if not self.path.exists():
+            return 0
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            block = 4096
+            while True:
+                f.seek(max(size - block, 0))
+                lines = f.read().splitlines()
+                if len(lines) > 1 or block >= size:
+                    break
+                block *= 2
+        return json.loads(lines[-1])["seq"] if lines else 0
+
+    def append(self, events: list) -> int:
+        """Number `events` after the last logged one, append them and return the last sequence number."""
+        seq = self.last_seq()
+        if not events:
+            return seq
+        now = datetime.now().isoformat()
+        with open(self.path, "a") as f:
+            for event in events:
+                seq += 1
+                f.write(json.dumps({"seq": seq, "time": now, **event}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return seq
+
+    def read(self, cursor: dict = None):
+        """
+        Return (events after `cursor`, new cursor). A cursor is
+        {"seq": last seen sequence number, "offset": byte offset to resume from};
+        the offset is only a hint and reading falls back to the start of the
+        log if it no longer fits.
+        """
+        cursor = cursor or {"seq": 0, "offset": 0}
+        if not self.path.exists():
+            return [], cursor
+        events = []
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            offset = cursor.get("offset", 0)
+            f.seek(offset if 0 <= offset <= size else 0)
+            for line in f:
+                event = json.loads(line)
+                if event["seq"] > cursor["seq"]:
+                    events.append(event)
+            end = f.tell()
+        seq = events[-1]["seq"] if events else cursor["seq"]
+        return events, {"seq": seq, "offset": end}
+
+
+def insert_events(store, new_rows) -> list:
+    """
+    Build the events of one batch of rows appended to `store`. Bucket
+    transitions are derived from the counts after the insert, so this can
+    run any time before more games are appended.
+    """
+    new_rows = np.asarray(new_rows, dtype=np.int64)
+    if len(new_rows) == 0:
+        return []
+    buckets = store.columns["bucket"]
+    records = store.game_records(new_rows)
+    events = [
+        {"type": "game_inserted", "row": row, "bucket": bucket_code_to_str(code), "game": game}
+        for row, code, game in zip(new_rows.tolist(), buckets[new_rows].tolist(), records)
+    ]
+
+    codes, added = np.unique(buckets[new_rows], return_counts=True)
+    after = np.asarray(store.counts).ravel()[codes]
+    before = after - added
+    for code in codes[(before == 0) & (after == 1)]:
+        events.append({
+            "type": "new_uniqorn",
+            "bucket": bucket_code_to_str(code),
+            "count_before": 0,
+            "count_after": 1,
+            "game": store.game_records(store.bucket_rows(code))[0],
+        })
+    for code, count in zip(codes[(before == 1) & (after > 1)], after[(before == 1) & (after > 1)]):
+        rows = store.bucket_rows(code)
+        is_new = np.isin(rows, new_rows)
+        events.append({
+            "type": "broken_uniqorn",
+            "bucket": bucket_code_to_str(code),
+            "count_before": 1,
+            "count_after": int(count),
+            "game": store.game_records(rows[~is_new])[0],
+            "broken_by": store.game_records(rows[is_new]),
+        })
+
+    events.append({
+        "type": "summary_delta",
+        "total_games": len(new_rows),
+        "total_buckets": int(np.count_nonzero(before == 0)),
+        "uniqorn_count": int(np.count_nonzero(after == 1) - np.count_nonzero(before == 1)),
+        "two_occurrence_count": int(np.count_nonzero(after == 2) - np.count_nonzero(before == 2)),
+    })
+    return events
+
+
+def log_insert(store, new_rows, store_dir: str = STORE_DIR) -> int:
+    """
+    Append the events of freshly inserted rows to the store's change log.
+    Call it before saving the store: a crash in between can then repeat
+    events on the next run but never lose them.
+    """
+    return ChangeLog(store_dir).append(insert_events(store, new_rows))
@@ -0,0 +1,86 @@
+"""
+JSON data products for the frontend, written next to the Excel outputs.
+
+Every output workbook is also emitted as compact, pre-sorted JSON (one
+array of row objects per sheet, dates as YYYY-MM-DD) under
+uniqorn-frontend/public/data/json/, so pages read a file and call
+JSON.parse instead of decoding a spreadsheet. manifest.json lists every
+product with its sheets, files, row counts and content hash; the Excel
+files stay as a secondary export.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from excel_export import sheets_hash
+
+PRODUCTS_DIR = str(Path(__file__).resolve().parent / "uniqorn-frontend" / "public" / "data" / "json")
+MANIFEST_FILE = "manifest.json"
+
+
+def _records(df: pd.DataFrame) -> list:
+    """Rows as JSON-ready dicts: dates as YYYY-MM-DD, missing values as null."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient="records")
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.tmp.json")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+
+def _read_manifest(products_dir) -> dict:
+    path = Path(products_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {"products": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def sheet_file(name: str, sheet: str, sheets: dict) -> str:
+    """Relative file of one sheet: NAME.json for single-sheet outputs, NAME/SHEET.json otherwise."""
+    if len(sheets) == 1:
+        return f"{name}.json"
+    return f"{name}/{sheet}.json"
+
+
+def write_product(excel_path: str, sheets: dict, products_dir: str = PRODUCTS_DIR) -> bool:
+    """
+    Write the JSON product of one output workbook and list it in the
+    manifest. Skipped (returns False) when the content hash is unchanged.
+    """
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {"Sheet1": sheets}
+    name = Path(excel_path).stem
+    content_hash = sheets_hash(sheets)
+    manifest = _read_manifest(products_dir)
+    entry = manifest["products"].get(name)
+    if entry is not None and entry["sha256"] == content_hash and all(
+        (Path(products_dir) / sheet["file"]).exists() for sheet in entry["sheets"].values()
+    ):
+        return False
+
+    listed = {}
+    for sheet, df in sheets.items():
+        file = sheet_file(name, sheet, sheets)
+        _write_json(Path(products_dir) / file, _records(df))
+        listed[sheet] = {"file": file, "rows": len(df)}
+    manifest["products"][name] = {
+        "source": Path(excel_path).name,
+        "sha256": content_hash,
+        "updated": datetime.now().isoformat(),
+        "sheets": listed,
+    }
+    manifest["updated"] = datetime.now().isoformat()
+    _write_json(Path(products_dir) / MANIFEST_FILE, manifest)
+    return True
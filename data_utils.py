@@ -5,6 +5,46 @@ import numpy as np
 # Historical data always comes from CSV, this only affects incremental updates
 USE_NBA_API = True # Set to False to use CSV for master precompute, True for incremental updates
 
+STAT_COLS = ["points", "assists", "reboundsTotal", "blocks", "steals"]
+
+# Shared bucket definition. Bins are right-closed with the lowest edge included,
+# matching pd.cut(..., include_lowest=True). Everything below is in bucket key
+# order: (points, rebounds, assists, steals, blocks)
+POINTS_BINS = [0, 5, 10, 15, 20, 25, 30, 40, 50, np.inf]
+REBOUNDS_BINS = [0, 2, 5, 10, 15, 20, np.inf]
+ASSISTS_BINS = [0, 2, 5, 8, 12, 20, np.inf]
+STEALS_BINS = [0, 1, 3, 5, 7, np.inf]
+BLOCKS_BINS = [0, 1, 3, 5, 7, np.inf]
+
+BIN_EDGES = (POINTS_BINS, REBOUNDS_BINS, ASSISTS_BINS, STEALS_BINS, BLOCKS_BINS)
+BUCKET_STAT_COLS = ("points", "reboundsTotal", "assists", "steals", "blocks")
+BIN_COLS = ("points_bin", "rebounds_bin", "assists_bin", "steals_bin", "blocks_bin")
+BUCKET_SHAPE = tuple(len(edges) - 1 for edges in BIN_EDGES)  # (9, 6, 6, 5, 5)
+NUM_BUCKETS = int(np.prod(BUCKET_SHAPE))
+
+# Streaming CSV loader: rows per chunk, and the only columns it reads, with compact dtypes.
+# The ids are read nullable, since a single empty id would fail an int64 read;
+# _clean_csv_frame drops or fills the missing ones and converts them to int64.
+CSV_CHUNK_ROWS = 250_000
+CSV_DTYPES = {
+    "personId": "Int64",
+    "gameId": "Int64",
+    "firstName": str,
+    "lastName": str,
+    "gameDateTimeEst": str,
+    "playerteamName": str,
+    "opponentteamName": str,
+    "points": np.float32,
+    "assists": np.float32,
+    "reboundsTotal": np.float32,
+    "rebounds": np.float32,
+    "blocks": np.float32,
+    "steals": np.float32,
+}
+
+# Columns that identify a duplicate row (gameDate is the game day, without the time)
+DEDUP_KEY = ["personId", "gameDate", "playerteamName", "points", "assists", "reboundsTotal", "blocks", "steals"]
+
 def standardize_deduplication(df, source="unknown"):
     """
     Standard deduplication logic for all scripts.
@@ -15,11 +55,8 @@ def standardize_deduplication(df, source="unknown"):
     # Add date column for deduplication (ignore time)
     df['gameDate'] = df['gameDateTimeEst'].dt.date
     
-    # Deduplication key using date only (not datetime)
-    dedup_key = ["personId", "gameDate", "playerteamName", "points", "assists", "reboundsTotal", "blocks", "steals"]
-    
     # Ensure all key columns exist
-    available_key = [col for col in dedup_key if col in df.columns]
+    available_key = [col for col in DEDUP_KEY if col in df.columns]
     
     if len(available_key) < 3:  # At minimum need personId, date, and team
         print(f"Warning: Insufficient columns for deduplication in {source}")
@@ -41,7 +78,7 @@ def load_from_nba_api(min_date=None):
     from datetime import datetime, timedelta
     
     if min_date is None:
-        # Default to last 7 days
+        # Default to last 7 days; the incremental update passes the store's latest date
         min_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
     
     print(f"Loading data from NBA API (since {min_date})...")
@@ -75,12 +112,28 @@ def load_from_csv(input_file="PlayerStatistics.csv", min_date=None):
     Load game data from CSV file (original Kaggle source).
     """
     print(f"Loading data from {input_file}")
-    df = pd.read_csv(input_file, low_memory=False)
+    df = _clean_csv_frame(pd.read_csv(input_file, low_memory=False))
     
-    # Convert dates
+    # Filter by date if specified
+    if min_date:
+        df = df[df["gameDateTimeEst"] >= pd.Timestamp(min_date)]
+        print(f"Filtered to dates >= {min_date}: {len(df)} rows")
+    
+    return df
+
+
+def _clean_csv_frame(df):
+    """Parse dates and ids, and fill/coerce the stat columns of raw CSV rows."""
     df["gameDateTimeEst"] = pd.to_datetime(df["gameDateTimeEst"], errors="coerce")
     df = df.dropna(subset=["gameDateTimeEst"])
 
+    # A row without a player id cannot be attributed; a missing gameId is 0 (unknown), as in the store
+    if "personId" in df.columns:
+        df = df.dropna(subset=["personId"])
+        df["personId"] = df["personId"].astype(np.int64)
+    if "gameId" in df.columns:
+        df["gameId"] = df["gameId"].fillna(0).astype(np.int64)
+
     if "reboundsTotal" in df.columns and "rebounds" in df.columns:
         df["reboundsTotal"] = df["reboundsTotal"].fillna(df["rebounds"])
     if "blocks" in df.columns:
@@ -88,18 +141,56 @@ def load_from_csv(input_file="PlayerStatistics.csv", min_date=None):
     if "steals" in df.columns:
         df["steals"] = df["steals"].fillna(0)
 
-    numeric_cols = [c for c in ["points", "assists", "reboundsTotal", "blocks", "steals"] if c in df.columns]
+    numeric_cols = [c for c in STAT_COLS if c in df.columns]
     if numeric_cols:
         df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    
-    # Filter by date if specified
-    if min_date:
-        df = df[df["gameDateTimeEst"] >= pd.Timestamp(min_date)]
-        print(f"Filtered to dates >= {min_date}: {len(df)} rows")
-    
     return df
 
 
+def _dedup_hashes(df):
+    """One 64-bit hash per row over DEDUP_KEY, with the game day standing in for gameDate."""
+    key = df[[col for col in DEDUP_KEY if col in df.columns and col != "gameDate"]].copy()
+    key["gameDate"] = df["gameDateTimeEst"].dt.normalize()
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def iter_csv_chunks(input_file="PlayerStatistics.csv", min_date=None, max_date=None, chunksize=CSV_CHUNK_ROWS):
+    """
+    Stream the CSV as bucketed frames of at most `chunksize` rows.
+
+    Only the CSV_DTYPES columns are read. Each chunk is cleaned like
+    load_from_csv, limited to game days in [min_date, max_date], deduplicated
+    like standardize_deduplication (against earlier chunks too, via a sorted
+    array of row hashes) and bucketed before it is yielded.
+    """
+    print(f"Streaming {input_file} in chunks of {chunksize:,} rows")
+    reader = pd.read_csv(
+        input_file,
+        usecols=lambda col: col in CSV_DTYPES,
+        dtype=CSV_DTYPES,
+        chunksize=chunksize,
+    )
+    seen = np.empty(0, dtype=np.uint64)
+    total_rows = kept_rows = 0
+    for chunk in reader:
+        total_rows += len(chunk)
+        chunk = _clean_csv_frame(chunk)
+        if min_date:
+            chunk = chunk[chunk["gameDateTimeEst"] >= pd.Timestamp(min_date)]
+        if max_date:
+            chunk = chunk[chunk["gameDateTimeEst"] < pd.Timestamp(max_date) + pd.Timedelta(days=1)]
+
+        hashes = _dedup_hashes(chunk)
+        fresh = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, seen)
+        seen = np.union1d(seen, hashes[fresh])
+
+        chunk = create_buckets(chunk[fresh].copy(), verbose=False)
+        kept_rows += len(chunk)
+        if len(chunk):
+            yield chunk
+    print(f"Streamed {input_file}: {total_rows:,} rows -> {kept_rows:,} bucketed games")
+
+
 def load_and_clean_data(input_file="PlayerStatistics.csv", filter_season=None, min_date=None):
     """
     Standard data loading and cleaning for all scripts.
@@ -116,19 +207,9 @@ def load_and_clean_data(input_file="PlayerStatistics.csv", filter_season=None, m
     
     # Assign season if needed
     if filter_season:
-        REGULAR_SEASONS = {
-            "2023-24": ("2023-10-01", "2024-04-13"),
-            "2024-25": ("2024-10-01", "2025-04-13"),
-            "2025-26": ("2025-10-01", "2026-04-13"),
-        }
-        
-        def assign_season(date: pd.Timestamp) -> str | None:
-            for season, (start, end) in REGULAR_SEASONS.items():
-                if pd.Timestamp(start) <= date <= pd.Timestamp(end):
-                    return season
-            return None
+        from season_calendar import assign_seasons
         
-        df["season"] = df["gameDateTimeEst"].apply(assign_season)
+        df["season"] = assign_seasons(df["gameDateTimeEst"])
         df = df.dropna(subset=["season"])
         df = df[df["season"] == filter_season]
         print(f"Filtered to season {filter_season}: {len(df)} rows")
@@ -138,18 +219,45 @@ def load_and_clean_data(input_file="PlayerStatistics.csv", filter_season=None, m
     
     return df
 
-def create_buckets(df):
+def bin_values(values, edges):
     """
-    Standard bucket creation for all scripts.
+    Vectorized equivalent of pd.cut(values, edges, labels=False, include_lowest=True).
+    Returns int bin indices, with -1 for missing or out-of-range values.
     """
-    points_bins = [0, 5, 10, 15, 20, 25, 30, 40, 50, np.inf]
-    assists_bins = [0, 2, 5, 8, 12, 20, np.inf]
-    rebounds_bins = [0, 2, 5, 10, 15, 20, np.inf]
-    blocks_bins = [0, 1, 3, 5, 7, np.inf]
-    steals_bins = [0, 1, 3, 5, 7, np.inf]
-    
-    STAT_COLS = ["points", "assists", "reboundsTotal", "blocks", "steals"]
+    values = np.asarray(values, dtype=float)
+    edges = np.asarray(edges, dtype=float)
+    bins = np.searchsorted(edges, values, side="left") - 1
+    bins[values == edges[0]] = 0
+    bins[np.isnan(values) | (values < edges[0]) | (values > edges[-1])] = -1
+    return bins
+
+
+def encode_bucket_bins(bins):
+    """Mixed-radix bucket code for a sequence of five bin arrays in bucket key order."""
+    return np.ravel_multi_index(tuple(np.asarray(b) for b in bins), BUCKET_SHAPE)
 
+
+def bucket_key_to_code(bucket_key) -> int:
+    """Encode a (points, rebounds, assists, steals, blocks) bin tuple as one integer."""
+    return int(np.ravel_multi_index(tuple(int(x) for x in bucket_key), BUCKET_SHAPE))
+
+
+def bucket_code_to_key(code) -> tuple:
+    """Decode an integer bucket code back into its bin tuple."""
+    return tuple(int(x) for x in np.unravel_index(int(code), BUCKET_SHAPE))
+
+
+def bucket_code_to_str(code) -> str:
+    """Format a bucket code as the "(a, b, c, d, e)" string used for bucket keys in JSON."""
+    return f"({', '.join(map(str, bucket_code_to_key(code)))})"
+
+
+def create_buckets(df, verbose=True):
+    """
+    Standard bucket creation for all scripts.
+    Adds the five *_bin columns and a single integer bucket_code
+    (see BUCKET_SHAPE; decode with bucket_code_to_key / bucket_code_to_str).
+    """
     numeric_cols = [c for c in STAT_COLS if c in df.columns]
     if numeric_cols:
         df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
@@ -163,41 +271,28 @@ def create_buckets(df):
     # Filter to games where all stats are available
     initial_rows = len(df)
     df = df.dropna(subset=STAT_COLS)
-    print(f"Filtered to complete stats: {initial_rows} -> {len(df)} rows")
+    if verbose:
+        print(f"Filtered to complete stats: {initial_rows} -> {len(df)} rows")
     
-    # Create buckets
-    df["points_bin"] = pd.cut(df["points"], points_bins, labels=False, include_lowest=True)
-    df["rebounds_bin"] = pd.cut(df["reboundsTotal"], rebounds_bins, labels=False, include_lowest=True)
-    df["assists_bin"] = pd.cut(df["assists"], assists_bins, labels=False, include_lowest=True)
-    df["steals_bin"] = pd.cut(df["steals"], steals_bins, labels=False, include_lowest=True)
-    df["blocks_bin"] = pd.cut(df["blocks"], blocks_bins, labels=False, include_lowest=True)
+    # Create buckets - ORDER: (points, rebounds, assists, steals, blocks)
+    bins = [bin_values(df[col].to_numpy(), edges) for col, edges in zip(BUCKET_STAT_COLS, BIN_EDGES)]
     
     # Remove any rows with missing bins
-    df = df.dropna(subset=["points_bin", "rebounds_bin", "assists_bin", "steals_bin", "blocks_bin"])
-    
-    # Convert to integers
-    df[["points_bin", "rebounds_bin", "assists_bin", "steals_bin", "blocks_bin"]] = df[
-        ["points_bin", "rebounds_bin", "assists_bin", "steals_bin", "blocks_bin"]
-    ].astype(int)
+    valid = np.all(np.stack(bins) >= 0, axis=0) if len(df) else np.zeros(0, dtype=bool)
+    bins = [b[valid] for b in bins]
     
-    # Create bucket key - NEW ORDER: (points, rebounds, assists, steals, blocks)
-    df["bucket_key"] = list(
-        zip(df["points_bin"], df["rebounds_bin"], df["assists_bin"], df["steals_bin"], df["blocks_bin"])
+    df = df.loc[valid].assign(
+        **{col: b.astype(np.int8) for col, b in zip(BIN_COLS, bins)},
+        bucket_code=encode_bucket_bins(bins).astype(np.int16),
     )
     
-    print(f"Created buckets: {len(df)} rows with valid bucket keys")
+    if verbose:
+        print(f"Created buckets: {len(df)} rows with valid bucket keys")
     
     return df
 
 def get_bucket_description(bucket_key):
     """Get a readable description of the bucket ranges"""
-    # Actual bucket boundaries based on pandas cut behavior
-    points_bins = [0, 5, 10, 15, 20, 25, 30, 40, 50, np.inf]
-    assists_bins = [0, 2, 5, 8, 12, 20, np.inf]
-    rebounds_bins = [0, 2, 5, 10, 15, 20, np.inf]
-    blocks_bins = [0, 1, 3, 5, 7, np.inf]
-    steals_bins = [0, 1, 3, 5, 7, np.inf]
-    
     # Correct ranges based on pandas cut behavior (include_lowest=True)
     points_ranges = ["0-5", "6-10", "11-15", "16-20", "21-25", "26-30", "31-40", "41-50", "51+"]
     assists_ranges = ["0-2", "3-5", "6-8", "9-12", "13-20", "21+"]
@@ -0,0 +1,81 @@
+"""
+Write-only Excel export for the pipeline outputs.
+
+A workbook is assembled as {sheet name: DataFrame} and streamed out in a
+single openpyxl write-only pass, which keeps memory constant instead of
+building the full cell model. The SHA-256 of the sheets' contents is
+recorded in excel_export_manifest.json together with the file's size and
+mtime; if the content and the file are unchanged, the workbook is not
+rewritten at all.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+
+EXPORT_MANIFEST = "excel_export_manifest.json"
+
+
+def sheets_hash(sheets: dict) -> str:
+    """Content hash of an ordered {sheet name: DataFrame} mapping."""
+    digest = hashlib.sha256()
+    for name, df in sheets.items():
+        digest.update(json.dumps([name, [str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _read_manifest(manifest_file) -> dict:
+    if not Path(manifest_file).exists():
+        return {}
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest_file, manifest: dict):
+    tmp_path = Path(f"{manifest_file}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_file)
+
+
+def _stream_workbook(path, sheets: dict):
+    """Write every sheet row by row through a write-only workbook, then swap the file in."""
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(title=name)
+        ws.append([str(c) for c in df.columns])
+        # Missing values become empty cells, like DataFrame.to_excel
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_workbook(path, sheets: dict, manifest_file: str = EXPORT_MANIFEST) -> bool:
+    """
+    Write `sheets` (in order) to the workbook at `path`, unless it already
+    holds exactly this content. Returns True if the file was written.
+    """
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {"Sheet1": sheets}
+    content_hash = sheets_hash(sheets)
+    manifest = _read_manifest(manifest_file)
+    entry = manifest.get(str(path))
+    if entry is not None and Path(path).exists():
+        stat = os.stat(path)
+        if (entry["sha256"], entry["size"], entry["mtime_ns"]) == (content_hash, stat.st_size, stat.st_mtime_ns):
+            return False
+
+    _stream_workbook(path, sheets)
+    stat = os.stat(path)
+    manifest[str(path)] = {"sha256": content_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    _write_manifest(manifest_file, manifest)
+    return True
@@ -1,15 +1,19 @@
-import subprocess
-import sys
 import time
-import os
 import json
 from pathlib import Path
 from datetime import datetime
 import numpy as np
+from change_log import ChangeLog, log_insert
+from data_products import write_product
+from excel_export import write_workbook
+from incremental_update_new import apply_incremental_update
+from master_bucket_store import STORE_DIR, write_summary
 from master_bucket_utils import MasterBucketDatabase
-from data_utils import get_bucket_description
+from radar_charts import render_charts
+from data_utils import bucket_code_to_key, get_bucket_description
+from season_aggregates import load_or_build
+from uniqueness_scoring import bucket_rarity
 import pandas as pd
-import plotly.graph_objects as go
 
 CURRENT_SEASON = "2025-26"
 
@@ -19,7 +23,6 @@ UNIQORN_LEADERS_MASTER_FILE = "Uniqorn_Master.xlsx"
 MOST_RECENT_GAMES_MASTER_FILE = "Most_Recent_Games_Master.xlsx"
 CURRENT_SEASON_UNIQORN_GAMES_MASTER_FILE = "CurrentSeason_UniqornGames_Master.xlsx"
 ULTIMATE_UNIQORN_GAMES_MASTER_FILE = "Ultimate_Uniqorn_Games_Master.xlsx"
-PREVIOUS_ULTIMATE_UNIQORN_GAMES_MASTER_FILE = "Previous_Ultimate_Uniqorn_Games_Master.xlsx"
 ULTIMATE_CHANGES_MASTER_FILE = "ultimate_changes_master.json"
 ULTIMATE_UNIQORN_LEADERBOARD_MASTER_FILE = "Ultimate_Uniqorn_Leaderboard_Master.xlsx"
 
@@ -27,39 +30,30 @@ SEASON_CHART_FOLDER_MASTER = str(BASE_DIR / "uniqorn-frontend" / "public" / "sea
 ULTIMATE_CHART_FOLDER_MASTER = str(BASE_DIR / "uniqorn-frontend" / "public" / "ultimate-charts-master")
 
 
-def run_script(script_name, description, timeout=None):
-    """Run a script and measure execution time."""
-    print(f"\n{'='*60}")
-    print(f"Running: {description}")
-    print(f"Script: {script_name}")
-    print(f"{'='*60}")
-    
-    start_time = time.time()
-    
-    try:
-        kwargs = {"capture_output": True, "text": True}
-        if timeout is not None:
-            kwargs["timeout"] = timeout
-        result = subprocess.run([sys.executable, script_name], **kwargs)
-        
-        execution_time = time.time() - start_time
-        
-        if result.returncode == 0:
-            print(f"✅ {description} - SUCCESS ({execution_time:.2f}s)")
-            if result.stdout:
-                print("Output:", result.stdout[-500:])  # Show last 500 chars
-        else:
-            print(f"❌ {description} - FAILED ({execution_time:.2f}s)")
-            print("Error:", result.stderr[-500:])  # Show last 500 chars
-            
-    except subprocess.TimeoutExpired:
-        print(f"⏰ {description} - TIMEOUT")
-    except Exception as e:
-        print(f"💥 {description} - ERROR: {e}")
-
-
-def _parse_bucket_str(bucket_str: str):
-    return tuple(int(x) for x in bucket_str.strip("()").split(", "))
+class PipelineSession:
+    """
+    One nightly run: the master store is loaded once, updated in memory,
+    saved once, and the same in-memory database is handed to every output
+    generator.
+    """
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        self.db = MasterBucketDatabase(store_dir)
+        self.new_rows = np.empty(0, dtype=np.int64)
+
+    @property
+    def store(self):
+        return self.db.store
+
+    def update(self):
+        """Apply the incremental NBA API update in memory and persist it."""
+        self.new_rows = apply_incremental_update(self.store)
+        if len(self.new_rows):
+            log_insert(self.store, self.new_rows, self.store_dir)
+            print("💾 Saving updated master database...")
+            self.store.save(self.store_dir)
+            write_summary(self.store)
 
 
 def _split_player_name(player: str):
@@ -74,203 +68,69 @@ def _ensure_parent_dir(path: str):
     Path(path).parent.mkdir(parents=True, exist_ok=True)
 
 
-def _write_or_replace_sheet(excel_path: str, sheet_name: str, df: pd.DataFrame):
-    from openpyxl import load_workbook
-
-    if Path(excel_path).exists():
-        book = load_workbook(excel_path)
-        if sheet_name in book.sheetnames:
-            del book[sheet_name]
-        with pd.ExcelWriter(excel_path, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-        return
-
-    _ensure_parent_dir(excel_path)
-    with pd.ExcelWriter(excel_path, engine="openpyxl", mode="w") as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-
-def _write_career_top50_sheet(excel_path: str, sheet_name: str = "AllTimeTop20", limit: int = 50):
-    from openpyxl import load_workbook
-
-    if not Path(excel_path).exists():
-        print(f"⚠️  {excel_path} not found; skipping career sheet")
-        return
-
-    wb = load_workbook(excel_path, read_only=True, data_only=True)
-    season_sheets = [s for s in wb.sheetnames if "-" in s]
-    if not season_sheets:
-        print("⚠️  No season sheets found in Uniqorn_Master.xlsx; skipping career sheet")
-        return
-
-    all_rows = []
-    for s in season_sheets:
-        try:
-            df = pd.read_excel(excel_path, sheet_name=s)
-        except Exception:
-            continue
-
-        needed = {"personId", "firstName", "lastName", "avg_weighted_uniqueness"}
-        if df.empty or not needed.issubset(set(df.columns)):
-            continue
-
-        df = df[["personId", "firstName", "lastName", "avg_weighted_uniqueness", "games"]].copy() if "games" in df.columns else df[["personId", "firstName", "lastName", "avg_weighted_uniqueness"]].copy()
-        df["avg_weighted_uniqueness"] = pd.to_numeric(df["avg_weighted_uniqueness"], errors="coerce")
-        all_rows.append(df)
-
-    if not all_rows:
-        print("⚠️  No valid season data for career sheet; skipping")
-        return
+def _export(excel_path: str, sheets):
+    """
+    Write an output as its JSON data product for the frontend and as a
+    streamed workbook, skipping whichever is unchanged.
+    """
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {"Sheet1": sheets}
+    rows = sum(len(df) for df in sheets.values())
+    if write_product(excel_path, sheets):
+        print(f"✅ Wrote {rows} rows to {Path(excel_path).stem} JSON")
+    if write_workbook(excel_path, sheets):
+        print(f"✅ Wrote {rows} rows to {excel_path}")
+    else:
+        print(f"⏭️  {excel_path} unchanged ({rows} rows), not rewritten")
 
-    combined = pd.concat(all_rows, ignore_index=True)
-    combined = combined.dropna(subset=["avg_weighted_uniqueness", "personId"])
-
-    career = (
-        combined.groupby(["personId", "firstName", "lastName"], as_index=False)["avg_weighted_uniqueness"]
-        .mean()
-        .rename(columns={"avg_weighted_uniqueness": "avg_weighted_uniqueness"})
-    )
-
-    career = career.sort_values("avg_weighted_uniqueness", ascending=False).head(limit).reset_index(drop=True)
-    _write_or_replace_sheet(excel_path, sheet_name, career)
-    print(f"✅ Career Top {limit} written to {excel_path} [{sheet_name}]")
-
-
-def _render_radar_chart(out_path: str, title: str, values: list[int]):
-    points_bins = [0, 5, 10, 15, 20, 25, 30, 40, 50, np.inf]
-    assists_bins = [0, 2, 5, 8, 12, 20, np.inf]
-    rebounds_bins = [0, 2, 5, 10, 15, 20, np.inf]
-    blocks_bins = [0, 1, 3, 5, 7, np.inf]
-    steals_bins = [0, 1, 3, 5, 7, np.inf]
-
-    labels = ["PTS", "AST", "REB", "BLK", "STL"]
-    max_bucket = max(
-        len(points_bins) - 2,
-        len(assists_bins) - 2,
-        len(rebounds_bins) - 2,
-        len(blocks_bins) - 2,
-        len(steals_bins) - 2,
-    )
-    accent = "rgb(56, 189, 248)"
-
-    values_closed = values + [values[0]]
-    labels_closed = labels + [labels[0]]
-
-    fig = go.Figure(
-        data=[
-            go.Scatterpolar(
-                r=values_closed,
-                theta=labels_closed,
-                fill="toself",
-                fillcolor="rgba(56, 189, 248, 0.20)",
-                line=dict(color=accent, width=3),
-                marker=dict(color=accent, size=6),
-            )
-        ]
-    )
-
-    fig.update_layout(
-        template="plotly_dark",
-        title=dict(text=title, x=0.5, xanchor="center", font=dict(size=14, color="rgba(224, 242, 254, 1)")),
-        margin=dict(l=40, r=40, t=70, b=40),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        polar=dict(
-            bgcolor="rgba(0,0,0,0)",
-            radialaxis=dict(range=[0, max_bucket], showticklabels=True, tickfont=dict(color="rgba(228,228,231,1)")),
-            angularaxis=dict(tickfont=dict(color="rgba(224,242,254,1)")),
-        ),
-        showlegend=False,
-    )
 
+def _render_radar_chart(out_path: str, title: str, values: list[int], backend: str = None):
+    """Render one chart, skipped when its (values, title, style, backend) hash is unchanged."""
     _ensure_parent_dir(out_path)
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            fig.write_image(out_path, width=700, height=700, scale=2)
-            return True
-        except Exception:
-            if attempt == max_retries - 1:
-                return False
-            time.sleep(1)
+    return render_charts([(out_path, title, values)], workers=1, backend=backend)["failed"] == 0
 
 
 def _collect_season_stats(db: MasterBucketDatabase, season: str):
     season_bucket_counts: dict[tuple[int, int, int, int, int], int] = {}
-    player_bucket_counts: dict[tuple[int, tuple[int, int, int, int, int]], int] = {}
     season_games: list[tuple[tuple[int, int, int, int, int], dict]] = []
-    player_names: dict[int, tuple[str, str]] = {}
 
-    for bucket_str, bucket_info in db.data.items():
-        bucket_key = _parse_bucket_str(bucket_str)
-        for game in bucket_info.get("games", []):
-            if game.get("season") != season:
-                continue
-            season_games.append((bucket_key, game))
-            season_bucket_counts[bucket_key] = season_bucket_counts.get(bucket_key, 0) + 1
+    store = db.store
+    rows = store.season_rows(season)
+    bucket_codes = store.columns["bucket"][rows].tolist()
 
-            pid = int(game.get("personId", 0))
-            player_bucket_counts[(pid, bucket_key)] = player_bucket_counts.get((pid, bucket_key), 0) + 1
-            if pid not in player_names:
-                fn, ln = _split_player_name(game.get("player", ""))
-                player_names[pid] = (fn, ln)
+    for code, game in zip(bucket_codes, store.game_records(rows)):
+        bucket_key = bucket_code_to_key(code)
+        season_games.append((bucket_key, game))
+        season_bucket_counts[bucket_key] = season_bucket_counts.get(bucket_key, 0) + 1
 
-    return season_games, season_bucket_counts, player_bucket_counts, player_names
+    return season_games, season_bucket_counts
 
 
-def generate_master_outputs():
+def generate_master_outputs(db: MasterBucketDatabase = None, new_rows=None):
     print("\n📊 Generating Master outputs...")
 
-    db = MasterBucketDatabase()
-    season_games, season_bucket_counts, player_bucket_counts, player_names = _collect_season_stats(db, CURRENT_SEASON)
+    if db is None:
+        db = MasterBucketDatabase()
+    season_games, season_bucket_counts = _collect_season_stats(db, CURRENT_SEASON)
 
     print("\n📈 Writing Uniqorn leaders (Master)...")
-    ALPHA = 0.10
-    per_player_sum: dict[int, float] = {}
-    per_player_games: dict[int, int] = {}
-    for bucket_key, game in season_games:
-        pid = int(game.get("personId", 0))
-        total = season_bucket_counts.get(bucket_key, 1)
-        self_count = player_bucket_counts.get((pid, bucket_key), 0)
-        effective_count = max(total - self_count, 1)
-        score = float(np.exp(-ALPHA * effective_count))
-        per_player_sum[pid] = per_player_sum.get(pid, 0.0) + score
-        per_player_games[pid] = per_player_games.get(pid, 0) + 1
-
-    rows = []
-    for pid, games in per_player_games.items():
-        if games <= 15:
-            continue
-        fn, ln = player_names.get(pid, ("Unknown", ""))
-        rows.append({
-            "personId": pid,
-            "firstName": fn,
-            "lastName": ln,
-            "season": CURRENT_SEASON,
-            "games": games,
-            "avg_weighted_uniqueness": round(per_player_sum.get(pid, 0.0) / games, 4),
-        })
-    leaders_df = pd.DataFrame(rows)
-    if not leaders_df.empty and "avg_weighted_uniqueness" in leaders_df.columns:
-        leaders_df = leaders_df.sort_values(by="avg_weighted_uniqueness", ascending=False)
-    _write_or_replace_sheet(UNIQORN_LEADERS_MASTER_FILE, CURRENT_SEASON, leaders_df)
+    # Only seasons with new games are rescored; career averages come from the table
+    aggregates = load_or_build(db.store, changed_rows=new_rows)
+    _export(UNIQORN_LEADERS_MASTER_FILE, aggregates.workbook_sheets(career_limit=50))
 
-    _write_career_top50_sheet(UNIQORN_LEADERS_MASTER_FILE, sheet_name="AllTimeTop20", limit=50)
+    season_rows = db.store.season_rows(CURRENT_SEASON)
+    season_codes = db.store.columns["bucket"][season_rows]
 
     print("\n🏀 Writing most recent games (Master)...")
     if season_games:
         most_recent_date = max(game.get("date") for _, game in season_games)
-        recent_games = [(bk, g) for bk, g in season_games if g.get("date") == most_recent_date]
+        # bucket_count=1 gives score 1.0, bucket_count=2 gives exp(-0.1*1)=0.9048, etc.
+        rarity = bucket_rarity(season_codes)
         games_analysis = []
-        ALPHA = 0.10
-        for bucket_key, game in recent_games:
-            pid = int(game.get("personId", 0))
+        for (bucket_key, game), uniqueness_score in zip(season_games, rarity.tolist()):
+            if game.get("date") != most_recent_date:
+                continue
             total = season_bucket_counts.get(bucket_key, 1)
-            # Use (total - 1) so that bucket_count=1 gives score 1.0
-            # bucket_count=2 gives exp(-0.1*1)=0.9048, etc.
-            uniqueness_score = float(np.exp(-ALPHA * (total - 1)))
             games_analysis.append({
                 "player": game.get("player"),
                 "date": most_recent_date,
@@ -284,8 +144,7 @@ def generate_master_outputs():
             })
 
         games_analysis.sort(key=lambda x: x["uniqueness_score"], reverse=True)
-        pd.DataFrame(games_analysis).to_excel(MOST_RECENT_GAMES_MASTER_FILE, index=False)
-        print(f"✅ Wrote {len(games_analysis)} rows to {MOST_RECENT_GAMES_MASTER_FILE}")
+        _export(MOST_RECENT_GAMES_MASTER_FILE, pd.DataFrame(games_analysis))
     else:
         print(f"⚠️  No season games found for {CURRENT_SEASON}")
 
@@ -313,20 +172,12 @@ def generate_master_outputs():
     uniqorn_export_df = pd.DataFrame(uniqorn_export_rows)
     if not uniqorn_export_df.empty and "game_date" in uniqorn_export_df.columns:
         uniqorn_export_df = uniqorn_export_df.sort_values("game_date", ascending=False)
-    uniqorn_export_df.to_excel(CURRENT_SEASON_UNIQORN_GAMES_MASTER_FILE, index=False)
-    print(f"✅ Wrote {len(uniqorn_export_df)} rows to {CURRENT_SEASON_UNIQORN_GAMES_MASTER_FILE}")
+    _export(CURRENT_SEASON_UNIQORN_GAMES_MASTER_FILE, uniqorn_export_df)
 
     print("\n🏆 Writing Ultimate Uniqorns (Master)...")
     ultimate_rows = []
 
-    for bucket_str, bucket_info in db.data.items():
-        if int(bucket_info.get("count", 0)) != 1:
-            continue
-        bucket_key = _parse_bucket_str(bucket_str)
-        games = bucket_info.get("games", [])
-        if not games:
-            continue
-        game = games[0]
+    for game in db.get_uniqorn_games():
         # Stats format: PTS/REB/AST/STL/BLK
         pts, reb, ast, stl, blk = (int(x) for x in str(game.get("stats", "0/0/0/0/0")).split("/"))
         fn, ln = _split_player_name(game.get("player", ""))
@@ -348,24 +199,27 @@ def generate_master_outputs():
     ultimate_df = pd.DataFrame(ultimate_rows)
     if not ultimate_df.empty and "game_date" in ultimate_df.columns:
         ultimate_df = ultimate_df.sort_values("game_date", ascending=False)
-    ultimate_df.to_excel(ULTIMATE_UNIQORN_GAMES_MASTER_FILE, index=False)
-    print(f"✅ Wrote {len(ultimate_df)} rows to {ULTIMATE_UNIQORN_GAMES_MASTER_FILE}")
+    _export(ULTIMATE_UNIQORN_GAMES_MASTER_FILE, ultimate_df)
 
     print("\n🔁 Writing Ultimate changes (Master)...")
-    def load_key(df: pd.DataFrame):
-        return set(
-            (row.firstName, row.lastName, str(pd.to_datetime(row.game_date).date()), int(row.points), int(row.assists), int(row.rebounds), int(row.blocks), int(row.steals))
-            for _, row in df.iterrows()
-        )
-
-    current_key = load_key(ultimate_df) if not ultimate_df.empty else set()
-    prev_key = set()
-    if Path(PREVIOUS_ULTIMATE_UNIQORN_GAMES_MASTER_FILE).exists():
-        prev_df = pd.read_excel(PREVIOUS_ULTIMATE_UNIQORN_GAMES_MASTER_FILE)
-        prev_key = load_key(prev_df)
+    # Only the change-log events since the last run are read; the cursor
+    # is kept in the changes file itself
+    previous = {}
+    if Path(ULTIMATE_CHANGES_MASTER_FILE).exists():
+        with open(ULTIMATE_CHANGES_MASTER_FILE, "r") as f:
+            previous = json.load(f)
+    events, cursor = ChangeLog(db.store_dir).read(previous.get("cursor"))
+
+    def game_key(game: dict):
+        pts, reb, ast, stl, blk = (int(x) for x in str(game.get("stats", "0/0/0/0/0")).split("/"))
+        fn, ln = _split_player_name(game.get("player", ""))
+        return (fn, ln, game.get("date"), pts, ast, reb, blk, stl)
 
-    new_ultimate = current_key - prev_key
-    broken_ultimate = prev_key - current_key
+    made = {game_key(e["game"]) for e in events if e["type"] == "new_uniqorn"}
+    broken = {game_key(e["game"]) for e in events if e["type"] == "broken_uniqorn"}
+    # A Uniqorn made and broken since the last run was never published
+    new_ultimate = made - broken
+    broken_ultimate = broken - made
 
     def to_dict(key_set):
         return [
@@ -383,12 +237,11 @@ def generate_master_outputs():
             for t in sorted(key_set)
         ]
 
-    changes = {"new": to_dict(new_ultimate), "broken": to_dict(broken_ultimate)}
+    changes = {"new": to_dict(new_ultimate), "broken": to_dict(broken_ultimate), "cursor": cursor}
     with open(ULTIMATE_CHANGES_MASTER_FILE, "w") as f:
         json.dump(changes, f, indent=2)
 
-    ultimate_df.to_excel(PREVIOUS_ULTIMATE_UNIQORN_GAMES_MASTER_FILE, index=False)
-    print(f"New: {len(new_ultimate)} | Broken: {len(broken_ultimate)}")
+    print(f"New: {len(new_ultimate)} | Broken: {len(broken_ultimate)} ({len(events)} change events)")
 
     print("\n🏅 Writing Ultimate leaderboard (Master)...")
     if not ultimate_df.empty and {"firstName", "lastName"}.issubset(set(ultimate_df.columns)):
@@ -399,8 +252,7 @@ def generate_master_outputs():
             .sort_values("uniqorn_games", ascending=False)
             .reset_index(drop=True)
         )
-        leaderboard.to_excel(ULTIMATE_UNIQORN_LEADERBOARD_MASTER_FILE, index=False)
-        print(f"✅ Wrote {len(leaderboard)} rows to {ULTIMATE_UNIQORN_LEADERBOARD_MASTER_FILE}")
+        _export(ULTIMATE_UNIQORN_LEADERBOARD_MASTER_FILE, leaderboard)
     else:
         print("⚠️  Ultimate master dataframe empty")
 
@@ -409,39 +261,34 @@ def main():
     print("📡 Data Source: NBA API (Official)")
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Check if master database exists
-    try:
-        db = MasterBucketDatabase()
-        stats = db.get_statistics()
-        if not stats.get("total_games"):
-            print("❌ Master database is missing or empty. Run: python master_bucket_precompute.py")
-            return
-        print(f"📂 Master Database: {stats['total_games']:,} games, {stats['total_buckets']:,} buckets")
-    except Exception as e:
-        print(f"❌ Master database not found! Run master_bucket_precompute.py first: {e}")
+    total_start_time = time.time()
+    
+    # Load the master database once for the whole run
+    session = PipelineSession()
+    if not len(session.store):
+        print("❌ Master database is missing or empty. Run: python master_bucket_precompute.py")
         return
+    print(f"📂 Master Database: {len(session.store):,} games, {session.store.summary.total_buckets:,} buckets")
     
-    # Pipeline steps - now using NBA API instead of Kaggle
-    # Removed: ("incremental_update.py", "Incremental data update (Kaggle -> PlayerStatistics.csv)", None)
-    # The incremental_update_new.py now fetches directly from NBA API via data_utils
+    # Pipeline steps share the session instead of reloading the database
     pipeline_steps = [
-        ("incremental_update_new.py", "Incremental update from NBA API (Master DB)", None),
-        ("generate_master_outputs", "Generate Master outputs", None),
+        (session.update, "Incremental update from NBA API (Master DB)"),
+        (lambda: generate_master_outputs(session.db, session.new_rows), "Generate Master outputs"),
     ]
     
-    total_start_time = time.time()
     successful_steps = 0
     
-    for script_name, description, timeout in pipeline_steps:
-        if script_name == "generate_master_outputs":
-            generate_master_outputs()
-            successful_steps += 1
-        else:
-            run_script(script_name, description, timeout=timeout)
+    for step, description in pipeline_steps:
+        print(f"\n{'='*60}")
+        print(f"Running: {description}")
+        print(f"{'='*60}")
+        step_start = time.time()
+        try:
+            step()
             successful_steps += 1
-        
-        # Brief pause between steps
-        time.sleep(1)
+            print(f"✅ {description} - SUCCESS ({time.time() - step_start:.2f}s)")
+        except Exception as e:
+            print(f"💥 {description} - ERROR: {e}")
     
     total_time = time.time() - total_start_time
     
@@ -450,16 +297,13 @@ def main():
     print("📊 FINAL STATISTICS")
     print(f"{'='*60}")
     
-    try:
-        db = MasterBucketDatabase()
-        stats = db.get_statistics()
-        print(f"🏀 Total Games: {stats['total_games']:,}")
-        print(f"🔢 Total Buckets: {stats['total_buckets']:,}")
-        print(f"🦄 Uniqorn Games: {stats['uniqorn_count']:,} ({stats['uniqorn_percentage']:.2f}%)")
-        print(f"👥 Two-Occurrence Games: {stats['two_occurrence_count']:,}")
-        print(f"📅 Date Range: {stats['date_range']['start']} to {stats['date_range']['end']}")
-    except Exception as e:
-        print(f"⚠️  Could not load final statistics: {e}")
+    stats = session.db.get_statistics()
+    print(f"🏀 Total Games: {stats['total_games']:,}")
+    print(f"🆕 New Games: {len(session.new_rows):,}")
+    print(f"🔢 Total Buckets: {stats['total_buckets']:,}")
+    print(f"🦄 Uniqorn Games: {stats['uniqorn_count']:,} ({stats['uniqorn_percentage']:.2f}%)")
+    print(f"👥 Two-Occurrence Games: {stats['two_occurrence_count']:,}")
+    print(f"📅 Date Range: {stats['date_range']['start']} to {stats['date_range']['end']}")
     
     print(f"\n✅ Successful steps: {successful_steps}/{len(pipeline_steps)}")
     print(f"⏱️  Total execution time: {total_time:.2f}s")
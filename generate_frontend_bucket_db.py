@@ -4,43 +4,50 @@ Only includes current season games, limited to 10 games per bucket.
 """
 import json
 
+import numpy as np
+
+from data_utils import bucket_code_to_str
+from master_bucket_store import STORE_DIR, BucketStore
+
 CURRENT_SEASON = "2025-26"
 MAX_GAMES_PER_BUCKET = 10
 
 def generate_frontend_bucket_db():
     print("Loading master bucket database...")
-    with open("master_bucket_database.json", "r") as f:
-        master_data = json.load(f)
-    
-    print(f"Loaded {len(master_data)} buckets")
-    
+    store = BucketStore.load(STORE_DIR)
+
+    buckets = store.columns["bucket"]
+    bucket_codes = np.unique(buckets)
+    print(f"Loaded {len(bucket_codes)} buckets")
+
+    # Filter to current season games only, most recent first
+    season_rows = store.rows_by_date_desc(store.season_rows(CURRENT_SEASON))
+    season_buckets = buckets[season_rows]
+
     frontend_data = {}
     total_games = 0
-    
-    for bucket_str, bucket_info in master_data.items():
-        # Filter to current season games only
-        season_games = [g for g in bucket_info.get("games", []) if g.get("season") == CURRENT_SEASON]
-        
+
+    for code in bucket_codes:
+        rows = season_rows[season_buckets == code]
+
         # Limit to MAX_GAMES_PER_BUCKET
-        limited_games = season_games[:MAX_GAMES_PER_BUCKET]
-        
-        frontend_data[bucket_str] = {
-            "count": len(season_games),
-            "games": limited_games
+        frontend_data[bucket_code_to_str(code)] = {
+            "count": len(rows),
+            "games": store.game_records(rows[:MAX_GAMES_PER_BUCKET])
         }
-        
-        total_games += len(season_games)
-    
+
+        total_games += len(rows)
+
     # Count non-zero buckets
     non_zero = sum(1 for b in frontend_data.values() if b["count"] > 0)
     print(f"Total {CURRENT_SEASON} games: {total_games}")
     print(f"Buckets with games: {non_zero}")
-    
+
     # Write to frontend
     output_path = "uniqorn-frontend/public/data/master_bucket_database.json"
     with open(output_path, "w") as f:
         json.dump(frontend_data, f, indent=2)
-    
+
     import os
     size = os.path.getsize(output_path)
     print(f"Saved to {output_path}: {size / 1024 / 1024:.2f} MB")
@@ -1,37 +1,18 @@
-import pandas as pd
 import numpy as np
-import json
 import time
-import unicodedata
 from datetime import datetime, timedelta
 from data_utils import load_and_clean_data, create_buckets
+from season_calendar import assign_seasons
+from change_log import log_insert
+from master_bucket_store import STORE_DIR, BucketStore, store_exists, store_frame, write_summary
 
-def incremental_update():
+def apply_incremental_update(store):
     """
-    Ultra-fast daily update that only processes new games
-    and merges them with the master bucket database.
+    Fetch games newer than the store's latest date and append the ones it
+    does not have yet, in memory. Returns the row indices of the new games.
     """
-    print("Starting Incremental Bucket Update")
-    print("=" * 60)
-    start_time = time.time()
-    
-    # Load master database
-    print(" Loading master bucket database...")
-    try:
-        with open("master_bucket_database.json", "r") as f:
-            master_data = json.load(f)
-        print(f"   Loaded {len(master_data):,} existing buckets")
-    except FileNotFoundError:
-        print("❌ Master database not found! Run master_bucket_precompute.py first")
-        return
-    
     # Get latest date from master data
-    latest_date = None
-    for bucket_info in master_data.values():
-        if bucket_info['games']:
-            game_date = bucket_info['games'][0]['date']  # Most recent game
-            if latest_date is None or game_date > latest_date:
-                latest_date = game_date
+    latest_date = str(store.columns["date"].max()) if len(store) else None
     
     if latest_date:
         # Look for games 3 days before latest date to catch any missed updates
@@ -49,7 +30,7 @@ def incremental_update():
     
     if len(new_df) == 0:
         print("No new games found. Database is up to date.")
-        return
+        return np.empty(0, dtype=np.int64)
     
     # Create buckets for new data
     print("Creating buckets for new data...")
@@ -57,121 +38,52 @@ def incremental_update():
     
     # Add season information
     print("Adding season information...")
-    REGULAR_SEASONS = {
-        "2023-24": ("2023-10-24", "2024-04-14"),
-        "2024-25": ("2024-10-22", "2025-04-13"),
-        "2025-26": ("2025-10-21", "2026-04-12"),
-    }
-    
-    def assign_season(date: pd.Timestamp) -> str | None:
-        for season, (start, end) in REGULAR_SEASONS.items():
-            if pd.Timestamp(start) <= date <= pd.Timestamp(end):
-                return season
-        return None
-    
-    new_df["season"] = new_df["gameDateTimeEst"].apply(assign_season)
+    new_df["season"] = assign_seasons(new_df["gameDateTimeEst"])
     new_df = new_df.dropna(subset=["season"])
     
     # Process new games and merge with master
     print("Processing new games and merging with master...")
-    new_games_count = 0
-    updated_buckets = 0
-    
-    # Determine rebounds column name (NBA API uses reboundsTotal, Kaggle might use either)
-    rebounds_col = 'reboundsTotal' if 'reboundsTotal' in new_df.columns else 'rebounds'
+    new_frame = store_frame(new_df)
     
-    for _, new_game in new_df.iterrows():
-        bucket_key = new_game['bucket_key']
-        bucket_str = f"({', '.join(map(str, bucket_key))})"
-        
-        # Create game record with normalized names
-        fn_normalized = unicodedata.normalize('NFD', str(new_game['firstName'])).encode('ascii', 'ignore').decode('utf-8')
-        ln_normalized = unicodedata.normalize('NFD', str(new_game['lastName'])).encode('ascii', 'ignore').decode('utf-8')
-        game_record = {
-            "player": f"{fn_normalized} {ln_normalized}",
-            "date": new_game['gameDateTimeEst'].strftime('%Y-%m-%d'),
-            "stats": f"{int(new_game['points'])}/{int(new_game[rebounds_col])}/{int(new_game['assists'])}/{int(new_game['steals'])}/{int(new_game['blocks'])}",
-            "team": new_game['playerteamName'],
-            "opponent": new_game['opponentteamName'],
-            "season": new_game['season'],
-            "personId": int(new_game['personId'])
-        }
-        
-        # Check if this game already exists in master data
-        if bucket_str in master_data:
-            existing_games = master_data[bucket_str]['games']
-            game_exists = any(
-                g['player'] == game_record['player'] and 
-                g['date'] == game_record['date'] 
-                for g in existing_games
-            )
-            
-            if not game_exists:
-                # Add new game to existing bucket
-                master_data[bucket_str]['games'].insert(0, game_record)  # Insert at front (most recent)
-                master_data[bucket_str]['count'] += 1
-                
-                # Update seasons and players (handle missing keys for older database formats)
-                if 'seasons' not in master_data[bucket_str]:
-                    master_data[bucket_str]['seasons'] = []
-                if 'players' not in master_data[bucket_str]:
-                    master_data[bucket_str]['players'] = []
-                    
-                if game_record['season'] not in master_data[bucket_str]['seasons']:
-                    master_data[bucket_str]['seasons'].append(game_record['season'])
-                if game_record['player'] not in master_data[bucket_str]['players']:
-                    master_data[bucket_str]['players'].append(game_record['player'])
-                
-                new_games_count += 1
-                updated_buckets += 1
-        else:
-            # Create new bucket
-            master_data[bucket_str] = {
-                "count": 1,
-                "games": [game_record],
-                "seasons": [game_record['season']],
-                "players": [game_record['player']]
-            }
-            new_games_count += 1
-            updated_buckets += 1
+    # Skip games already in the master database, probing the persisted
+    # (personId, date) game key index instead of scanning bucket contents
+    new_rows = store.append_new_games(new_frame)
+    updated_buckets = len(np.unique(store.columns["bucket"][new_rows]))
     
-    print(f"   Added {new_games_count} new games")
+    print(f"   Added {len(new_rows)} new games")
     print(f"   Updated {updated_buckets} buckets")
+    return new_rows
+
+
+def incremental_update():
+    """
+    Ultra-fast daily update that only processes new games
+    and merges them with the master bucket database.
+    """
+    print("Starting Incremental Bucket Update")
+    print("=" * 60)
+    start_time = time.time()
     
-    # Save updated master data
+    # Load master database
+    print(" Loading master bucket database...")
+    if not store_exists(STORE_DIR):
+        print("❌ Master database not found! Run master_bucket_precompute.py first")
+        return
+    store = BucketStore.load(STORE_DIR)
+    print(f"   Loaded {len(store):,} existing games")
+    
+    new_rows = apply_incremental_update(store)
+    if len(new_rows) == 0:
+        return
+    
+    # Log the changes, then save updated master data
+    log_insert(store, new_rows, STORE_DIR)
     print("Saving updated master database...")
-    with open("master_bucket_database.json", "w") as f:
-        json.dump(master_data, f)
+    store.save(STORE_DIR)
     
     # Update summary statistics
     print("Updating summary statistics...")
-    all_seasons = set()
-    for bucket in master_data.values():
-        if 'seasons' in bucket:
-            all_seasons.update(bucket['seasons'])
-    
-    summary = {
-        "total_games": sum(bucket['count'] for bucket in master_data.values()),
-        "total_buckets": len(master_data),
-        "total_seasons": len(all_seasons),
-        "date_range": {
-            "start": min(bucket['games'][-1]['date'] for bucket in master_data.values() if bucket['games']),
-            "end": max(bucket['games'][0]['date'] for bucket in master_data.values() if bucket['games'])
-        },
-        "uniqorn_count": len([b for b in master_data.values() if b['count'] == 1]),
-        "two_occurrence_count": len([b for b in master_data.values() if b['count'] == 2]),
-        "last_updated": datetime.now().isoformat(),
-        "bucket_distribution": {
-            "1": len([b for b in master_data.values() if b['count'] == 1]),
-            "2": len([b for b in master_data.values() if b['count'] == 2]),
-            "3-5": len([b for b in master_data.values() if 3 <= b['count'] <= 5]),
-            "6-10": len([b for b in master_data.values() if 6 <= b['count'] <= 10]),
-            "11+": len([b for b in master_data.values() if b['count'] >= 11])
-        }
-    }
-    
-    with open("master_bucket_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
+    summary = write_summary(store)
     
     # Performance summary
     end_time = time.time()
@@ -180,11 +92,11 @@ def incremental_update():
     print("=" * 60)
     print("Incremental Update Complete!")
     print(f"   Duration: {duration:.2f} seconds")
-    print(f"   New games added: {new_games_count}")
+    print(f"   New games added: {len(new_rows)}")
     print(f"   Total games: {summary['total_games']:,}")
     print(f"   Total buckets: {summary['total_buckets']:,}")
     print(f"   Uniqorn games: {summary['uniqorn_count']:,}")
-    print(f"   Database updated: master_bucket_database.json")
+    print(f"   Database updated: {STORE_DIR}/")
     print("=" * 60)
 
 if __name__ == "__main__":
@@ -15,6 +15,8 @@ from scipy.stats import norm, rankdata
 from datetime import datetime
 import unicodedata
 
+from stats_cache import load_player_statistics
+
 CURRENT_SEASON = "2025-26"
 
 STATS = {
@@ -43,37 +45,12 @@ def normalize_name(name):
 def load_current_season_data():
     print(f"Loading {CURRENT_SEASON} statlines...")
 
-    df = pd.read_csv("PlayerStatistics.csv")
-
-    df["gameDateTimeEst"] = pd.to_datetime(df["gameDateTimeEst"], errors="coerce")
-    df = df.dropna(subset=["gameDateTimeEst"])
-
-    SEASONS = {
-        "2023-24": ("2023-10-01", "2024-04-13"),
-        "2024-25": ("2024-10-01", "2025-04-13"),
-        "2025-26": ("2025-10-21", "2026-04-13"),
-    }
-
-    def assign_season(date):
-        for season, (start, end) in SEASONS.items():
-            if pd.Timestamp(start) <= date <= pd.Timestamp(end):
-                return season
-        return None
-
-    df["season"] = df["gameDateTimeEst"].apply(assign_season)
-    df = df[df["season"] == CURRENT_SEASON].copy()
+    # Only this season's partition of the cleaned, deduplicated and bucketed cache
+    df = load_player_statistics("PlayerStatistics.csv", seasons=[CURRENT_SEASON])
 
     df["firstName"] = df["firstName"].apply(normalize_name)
     df["lastName"] = df["lastName"].apply(normalize_name)
 
-    for col in STATS:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df["blocks"] = df["blocks"].fillna(0)
-    df["steals"] = df["steals"].fillna(0)
-
-    df = df.dropna(subset=STATS)
-
     print(f"Loaded {len(df)} games")
     return df
 
@@ -12,6 +12,8 @@ from scipy.stats import gaussian_kde
 from datetime import datetime
 import unicodedata
 
+from stats_cache import load_player_statistics
+
 CURRENT_SEASON = '2024-25'
 
 def normalize_name(name):
@@ -25,51 +27,13 @@ def load_current_season_data():
     """Load ALL current season game data from PlayerStatistics.csv"""
     print(f"Loading ALL statlines from {CURRENT_SEASON} season from PlayerStatistics.csv...")
     
-    # Load from CSV which has full historical data
-    df = pd.read_csv('PlayerStatistics.csv', low_memory=False)
-    
-    # Convert date column
-    df['gameDateTimeEst'] = pd.to_datetime(df['gameDateTimeEst'], errors='coerce')
-    df = df.dropna(subset=['gameDateTimeEst'])
-    
-    # Assign season based on date
-    REGULAR_SEASONS = {
-        "2023-24": ("2023-10-01", "2024-04-13"),
-        "2024-25": ("2024-10-01", "2025-04-13"),
-        "2025-26": ("2025-10-01", "2026-04-13"),
-    }
-    
-    def assign_season(date):
-        for season, (start, end) in REGULAR_SEASONS.items():
-            if pd.Timestamp(start) <= date <= pd.Timestamp(end):
-                return season
-        return None
-    
-    df['season'] = df['gameDateTimeEst'].apply(assign_season)
-    df = df.dropna(subset=['season'])
-    
-    # Filter for current season
-    df_current = df[df['season'] == CURRENT_SEASON].copy()
+    # Only this season's partition of the cleaned, deduplicated and bucketed cache
+    df_current = load_player_statistics('PlayerStatistics.csv', seasons=[CURRENT_SEASON])
     
     # Normalize player names
     df_current['firstName'] = df_current['firstName'].apply(normalize_name)
     df_current['lastName'] = df_current['lastName'].apply(normalize_name)
     
-    # Ensure numeric columns
-    numeric_cols = ['points', 'assists', 'reboundsTotal', 'blocks', 'steals']
-    for col in numeric_cols:
-        if col in df_current.columns:
-            df_current[col] = pd.to_numeric(df_current[col], errors='coerce')
-    
-    # Fill missing blocks/steals with 0
-    if 'blocks' in df_current.columns:
-        df_current['blocks'] = df_current['blocks'].fillna(0)
-    if 'steals' in df_current.columns:
-        df_current['steals'] = df_current['steals'].fillna(0)
-    
-    # Drop any rows with missing stats
-    df_current = df_current.dropna(subset=numeric_cols)
-    
     print(f"Loaded {len(df_current)} games from {CURRENT_SEASON} season")
     print(f"Unique players: {df_current['personId'].nunique()}")
     
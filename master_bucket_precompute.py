@@ -1,80 +1,105 @@
-import json
+import io
+import os
 import time
-from datetime import datetime
-import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
 
-from data_utils import load_and_clean_data, create_buckets
+from data_utils import CSV_DTYPES, _clean_csv_frame, _dedup_hashes, create_buckets
+from master_bucket_store import STORE_DIR, BucketStore, store_frame, write_summary
+from season_calendar import assign_seasons
 
 
 INPUT_FILE = "PlayerStatistics.csv"
 MASTER_FILE = "master_bucket_database.json"
 SUMMARY_FILE = "master_bucket_summary.json"
 
-
-REGULAR_SEASONS = {
-    "1973-74": ("1973-10-09", "1974-03-27"),
-    "1974-75": ("1974-10-17", "1975-04-06"),
-    "1975-76": ("1975-10-23", "1976-04-11"),
-    "1976-77": ("1976-10-21", "1977-04-10"),
-    "1977-78": ("1977-10-18", "1978-04-09"),
-    "1978-79": ("1978-10-12", "1979-04-07"),
-    "1979-80": ("1979-10-12", "1980-04-06"),
-    "1980-81": ("1980-10-10", "1981-04-05"),
-    "1981-82": ("1981-10-09", "1982-04-03"),
-    "1982-83": ("1982-10-08", "1983-04-06"),
-    "1983-84": ("1983-10-11", "1984-04-08"),
-    "1984-85": ("1984-10-12", "1985-04-07"),
-    "1985-86": ("1985-10-25", "1986-04-06"),
-    "1986-87": ("1986-10-31", "1987-04-04"),
-    "1987-88": ("1987-11-06", "1988-04-09"),
-    "1988-89": ("1988-11-04", "1989-04-23"),
-    "1989-90": ("1989-11-03", "1990-04-22"),
-    "1990-91": ("1990-11-02", "1991-04-21"),
-    "1991-92": ("1991-11-01", "1992-04-19"),
-    "1992-93": ("1992-11-06", "1993-04-25"),
-    "1993-94": ("1993-11-05", "1994-04-24"),
-    "1994-95": ("1994-11-04", "1995-04-23"),
-    "1995-96": ("1995-11-03", "1996-04-21"),
-    "1996-97": ("1996-11-01", "1997-04-20"),
-    "1997-98": ("1997-10-31", "1998-04-19"),
-    "1998-99": ("1998-10-30", "1999-04-18"),
-    "1999-00": ("1999-11-02", "2000-04-16"),
-    "2000-01": ("2000-10-31", "2001-04-15"),
-    "2001-02": ("2001-10-30", "2002-04-14"),
-    "2002-03": ("2002-10-29", "2003-04-16"),
-    "2003-04": ("2003-10-28", "2004-04-14"),
-    "2004-05": ("2004-11-02", "2005-04-20"),
-    "2005-06": ("2005-11-01", "2006-04-19"),
-    "2006-07": ("2006-10-31", "2007-04-18"),
-    "2007-08": ("2007-10-30", "2008-04-16"),
-    "2008-09": ("2008-10-28", "2009-04-15"),
-    "2009-10": ("2009-10-27", "2010-04-14"),
-    "2010-11": ("2010-10-26", "2011-04-13"),
-    "2011-12": ("2011-12-25", "2012-04-26"),
-    "2012-13": ("2012-10-30", "2013-04-17"),
-    "2013-14": ("2013-10-29", "2014-04-16"),
-    "2014-15": ("2014-10-28", "2015-04-15"),
-    "2015-16": ("2015-10-27", "2016-04-13"),
-    "2016-17": ("2016-10-25", "2017-04-12"),
-    "2017-18": ("2017-10-17", "2018-04-11"),
-    "2018-19": ("2018-10-16", "2019-04-10"),
-    "2019-20": ("2019-10-22", "2020-03-11"),
-    "2020-21": ("2020-12-22", "2021-05-16"),
-    "2021-22": ("2021-10-19", "2022-04-10"),
-    "2022-23": ("2022-10-18", "2023-04-09"),
-    "2023-24": ("2023-10-24", "2024-04-14"),
-    "2024-25": ("2024-10-22", "2025-04-13"),
-    "2025-26": ("2025-10-21", "2026-04-12"),
-}
-
-
-def assign_season(date: pd.Timestamp) -> str | None:
-    for season, (start, end) in REGULAR_SEASONS.items():
-        if pd.Timestamp(start) <= date <= pd.Timestamp(end):
-            return season
-    return None
+# The columnar store is the primary output; the nested JSON is an optional export
+EXPORT_JSON = False
+
+# Worker processes (1 = serial), and the most CSV bytes one worker task reads at a time
+WORKERS = os.cpu_count() or 1
+RANGE_BYTES = 64 * 1024 * 1024
+
+
+def csv_ranges(input_file, parts: int):
+    """
+    Split the CSV after its header into about `parts` byte ranges (more if
+    a range would exceed RANGE_BYTES), each starting at a line boundary.
+    Returns the header line and the (start, end) offsets in file order.
+    Assumes no quoted field contains a newline, as in PlayerStatistics.csv.
+    """
+    size = os.path.getsize(input_file)
+    with open(input_file, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        parts = max(parts, -(-(size - data_start) // RANGE_BYTES), 1)
+        bounds = [data_start]
+        for i in range(1, parts):
+            f.seek(data_start + (size - data_start) * i // parts)
+            f.readline()
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+    return header, list(zip(bounds[:-1], bounds[1:]))
+
+
+def _build_range_store(input_file, header: bytes, start: int, end: int):
+    """
+    Parse, clean, bucket and season-assign one byte range of the CSV and encode
+    it as a partial store with its own bucket count grid (runs in a worker
+    process). Returns the store, the game timestamps and the rows' dedup hashes.
+    """
+    with open(input_file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(header + data), usecols=lambda col: col in CSV_DTYPES, dtype=CSV_DTYPES)
+    chunk = _clean_csv_frame(chunk)
+
+    # Same dedup key as iter_csv_chunks: the first of repeated rows in this range is kept,
+    # repeats across ranges are dropped by the merge
+    hashes = _dedup_hashes(chunk)
+    first = ~pd.Series(hashes).duplicated().to_numpy()
+    chunk = chunk[first].assign(dedup_hash=hashes[first])
+
+    chunk = create_buckets(chunk, verbose=False)
+    chunk = chunk.assign(season=assign_seasons(chunk["gameDateTimeEst"])).dropna(subset=["season"])
+    store = BucketStore.from_frame(store_frame(chunk), indexes=False)
+    return store, chunk["gameDateTimeEst"].to_numpy().astype("datetime64[ns]"), chunk["dedup_hash"].to_numpy()
+
+
+def build_store(input_file=INPUT_FILE, workers: int = WORKERS) -> BucketStore:
+    """
+    Build the store from the CSV. Every byte range is turned into a partial
+    store (with its bucket count grid) in a process pool when workers > 1.
+    The partials are merged in file order, keeping the first of any repeated
+    rows, and their count grids summed; games are then sorted most recent
+    first with a stable sort, so every worker count produces the same store.
+    """
+    header, ranges = csv_ranges(input_file, workers)
+    if workers <= 1:
+        parts = [_build_range_store(input_file, header, start, end) for start, end in ranges]
+    else:
+        parts = []
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start, end in ranges:
+                pending.append(executor.submit(_build_range_store, input_file, header, start, end))
+                # Bound the ranges in flight so memory stays flat
+                if len(pending) >= 2 * workers:
+                    parts.append(pending.popleft().result())
+            parts.extend(future.result() for future in pending)
+
+    if not parts:
+        return BucketStore.empty()
+    timestamps = np.concatenate([times for _, times, _ in parts]).astype(np.int64)
+    hashes = np.concatenate([hashes for _, _, hashes in parts])
+    _, first = np.unique(hashes, return_index=True)
+    keep = np.sort(first)
+    order = keep[np.argsort(-timestamps[keep], kind="stable")]
+    return BucketStore.merge([store for store, _, _ in parts], order)
 
 
 def master_bucket_precompute():
@@ -82,109 +107,18 @@ def master_bucket_precompute():
     print("📦 Master Bucket Precompute")
     print("=" * 60)
 
-    print("📊 Loading and cleaning data...")
-    df = load_and_clean_data(INPUT_FILE, min_date="1973-10-01")
-
-    print("🔢 Creating buckets...")
-    df = create_buckets(df)
-
-    print("📅 Assigning seasons...")
-    df["season"] = df["gameDateTimeEst"].apply(assign_season)
-    df = df.dropna(subset=["season"]).copy()
-
-    df = df.sort_values("gameDateTimeEst", ascending=False)
-
-    master_data: dict[str, dict] = {}
-
-    min_date = None
-    max_date = None
-    players_set: dict[str, set] = {}
-    seasons_set: dict[str, set] = {}
-
-    print(f"🏀 Building master database from {len(df):,} rows...")
-
-    for row in df.itertuples(index=False):
-        bucket_key = getattr(row, "bucket_key")
-        bucket_str = f"({', '.join(map(str, bucket_key))})"
-
-        dt = getattr(row, "gameDateTimeEst")
-        date_str = pd.to_datetime(dt).strftime("%Y-%m-%d")
-
-        if max_date is None or date_str > max_date:
-            max_date = date_str
-        if min_date is None or date_str < min_date:
-            min_date = date_str
-
-        fn = getattr(row, "firstName")
-        ln = getattr(row, "lastName")
-        # Normalize names to remove diacritics (Jokić -> Jokic, Dončić -> Doncic)
-        fn_normalized = unicodedata.normalize('NFD', str(fn)).encode('ascii', 'ignore').decode('utf-8')
-        ln_normalized = unicodedata.normalize('NFD', str(ln)).encode('ascii', 'ignore').decode('utf-8')
-        player = f"{fn_normalized} {ln_normalized}".strip()
-
-        game_record = {
-            "player": player,
-            "date": date_str,
-            "stats": f"{int(getattr(row, 'points'))}/{int(getattr(row, 'reboundsTotal'))}/{int(getattr(row, 'assists'))}/{int(getattr(row, 'steals'))}/{int(getattr(row, 'blocks'))}",
-            "team": getattr(row, "playerteamName"),
-            "opponent": getattr(row, "opponentteamName"),
-            "season": getattr(row, "season"),
-            "personId": int(getattr(row, "personId")),
-        }
-
-        if bucket_str not in master_data:
-            master_data[bucket_str] = {
-                "count": 1,
-                "games": [game_record],
-                "seasons": [game_record["season"]],
-                "players": [player],
-            }
-            seasons_set[bucket_str] = {game_record["season"]}
-            players_set[bucket_str] = {player}
-        else:
-            master_data[bucket_str]["count"] += 1
-            master_data[bucket_str]["games"].append(game_record)
-
-            if game_record["season"] not in seasons_set[bucket_str]:
-                seasons_set[bucket_str].add(game_record["season"])
-                master_data[bucket_str]["seasons"].append(game_record["season"])
-
-            if player not in players_set[bucket_str]:
-                players_set[bucket_str].add(player)
-                master_data[bucket_str]["players"].append(player)
+    print(f"📊 Loading {INPUT_FILE} ({WORKERS} workers)...")
+    store = build_store(INPUT_FILE, WORKERS)
+    print(f"🏀 Built master database from {len(store):,} games")
 
     print("💾 Saving master database...")
-    with open(MASTER_FILE, "w") as f:
-        json.dump(master_data, f)
+    store.save(STORE_DIR)
+    if EXPORT_JSON:
+        print(f"💾 Exporting {MASTER_FILE}...")
+        store.export_json(MASTER_FILE)
 
     print("📈 Writing summary...")
-    total_games = sum(b["count"] for b in master_data.values())
-    uniqorn_count = sum(1 for b in master_data.values() if b.get("count") == 1)
-    two_occurrence_count = sum(1 for b in master_data.values() if b.get("count") == 2)
-
-    all_seasons = set()
-    for b in master_data.values():
-        all_seasons.update(b.get("seasons", []))
-
-    summary = {
-        "total_games": total_games,
-        "total_buckets": len(master_data),
-        "total_seasons": len(all_seasons),
-        "date_range": {"start": min_date, "end": max_date},
-        "uniqorn_count": uniqorn_count,
-        "two_occurrence_count": two_occurrence_count,
-        "last_updated": datetime.now().isoformat(),
-        "bucket_distribution": {
-            "1": sum(1 for b in master_data.values() if b.get("count") == 1),
-            "2": sum(1 for b in master_data.values() if b.get("count") == 2),
-            "3-5": sum(1 for b in master_data.values() if 3 <= int(b.get("count", 0)) <= 5),
-            "6-10": sum(1 for b in master_data.values() if 6 <= int(b.get("count", 0)) <= 10),
-            "11+": sum(1 for b in master_data.values() if int(b.get("count", 0)) >= 11),
-        },
-    }
-
-    with open(SUMMARY_FILE, "w") as f:
-        json.dump(summary, f, indent=2)
+    summary = write_summary(store, SUMMARY_FILE)
 
     duration = time.time() - start_time
     print("=" * 60)
@@ -193,7 +127,9 @@ def master_bucket_precompute():
     print(f"   Total games: {summary['total_games']:,}")
     print(f"   Total buckets: {summary['total_buckets']:,}")
     print(f"   Date range: {summary['date_range']['start']} to {summary['date_range']['end']}")
-    print(f"   Output: {MASTER_FILE}")
+    print(f"   Output: {STORE_DIR}/")
+    if EXPORT_JSON:
+        print(f"   Output: {MASTER_FILE}")
     print(f"   Output: {SUMMARY_FILE}")
     print("=" * 60)
 
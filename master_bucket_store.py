@@ -0,0 +1,788 @@
+"""
+Columnar storage engine for the master bucket database.
+
+Every game is one row across a set of typed NumPy arrays, each saved as its
+own .npy file and memory-mapped on load. Team, season and player strings are
+dictionary encoded; the dictionaries live in meta.json next to the arrays.
+The nested master_bucket_database.json is now only an optional export.
+"""
+import bisect
+import json
+import os
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_utils import (
+    BUCKET_SHAPE,
+    NUM_BUCKETS,
+    bucket_code_to_str,
+    bucket_key_to_code,
+)
+
+STORE_DIR = "master_bucket_store"
+META_FILE = "meta.json"
+COUNTS_FILE = "bucket_counts.npy"
+SUMMARY_FILE = "master_bucket_summary.json"
+STORE_VERSION = 1
+
+COUNT_DTYPE = np.dtype(np.int64)
+
+COLUMN_DTYPES = {
+    "personId": np.dtype(np.int32),
+    "gameId": np.dtype(np.int64),
+    "date": np.dtype("datetime64[D]"),
+    "bucket": np.dtype(np.int16),
+    "points": np.dtype(np.int16),
+    "rebounds": np.dtype(np.int16),
+    "assists": np.dtype(np.int16),
+    "steals": np.dtype(np.int16),
+    "blocks": np.dtype(np.int16),
+    "team": np.dtype(np.int16),
+    "opponent": np.dtype(np.int16),
+    "season": np.dtype(np.int16),
+    "player": np.dtype(np.int32),
+}
+
+# Dictionary-encoded columns and the dictionary each one indexes into
+DICTIONARY_COLUMNS = {
+    "team": "teams",
+    "opponent": "teams",
+    "season": "seasons",
+    "player": "players",
+}
+
+
+# Columns of a data_utils frame that store_frame() reads
+SOURCE_COLUMNS = (
+    "personId", "gameId", "firstName", "lastName", "gameDateTimeEst", "bucket_code",
+    "points", "reboundsTotal", "rebounds", "assists", "steals", "blocks",
+    "playerteamName", "opponentteamName", "season",
+)
+
+
+def normalize_name(name) -> str:
+    """Remove diacritics from a name (Jokić -> Jokic, Dončić -> Doncic)."""
+    return unicodedata.normalize('NFD', str(name)).encode('ascii', 'ignore').decode('utf-8')
+
+
+def store_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a bucketed, season-assigned frame from data_utils into the
+    column layout expected by BucketStore.from_frame.
+    """
+    rebounds_col = "reboundsTotal" if "reboundsTotal" in df.columns else "rebounds"
+
+    # Normalize each distinct (personId, firstName, lastName) once, not every row
+    name_codes = df.groupby(
+        ["personId", "firstName", "lastName"], sort=False, dropna=False
+    ).ngroup().to_numpy()
+    _, first_rows = np.unique(name_codes, return_index=True)
+    names = df.iloc[first_rows]
+    unique_players = np.array([
+        f"{normalize_name(first)} {normalize_name(last)}".strip()
+        for first, last in zip(names["firstName"], names["lastName"])
+    ], dtype=object)
+    players = unique_players[name_codes]
+
+    if "gameId" in df.columns:
+        game_ids = pd.to_numeric(df["gameId"], errors="coerce").fillna(0).astype(np.int64).to_numpy()
+    else:
+        game_ids = np.zeros(len(df), dtype=np.int64)
+
+    return pd.DataFrame({
+        "personId": df["personId"].astype(int).to_numpy(),
+        "gameId": game_ids,
+        "player": players,
+        "date": pd.to_datetime(df["gameDateTimeEst"]).dt.normalize().to_numpy(),
+        "bucket": df["bucket_code"].to_numpy(),
+        "points": df["points"].astype(int).to_numpy(),
+        "rebounds": df[rebounds_col].astype(int).to_numpy(),
+        "assists": df["assists"].astype(int).to_numpy(),
+        "steals": df["steals"].astype(int).to_numpy(),
+        "blocks": df["blocks"].astype(int).to_numpy(),
+        "team": df["playerteamName"].to_numpy(),
+        "opponent": df["opponentteamName"].to_numpy(),
+        "season": df["season"].to_numpy(),
+    })
+
+
+def _save_array(path: Path, values):
+    """np.save to a temporary file, then atomically replace `path`."""
+    tmp_path = path.with_name(f"{path.stem}.tmp.npy")
+    np.save(tmp_path, np.ascontiguousarray(values))
+    os.replace(tmp_path, path)
+
+
+def _load_array(path: Path, mmap: bool = True) -> np.ndarray:
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+def _encode_strings(values, dictionary: list, lookup: dict) -> np.ndarray:
+    """Map strings to dictionary codes, extending the dictionary with unseen values."""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object).fillna("").astype(str))
+    unique_codes = np.empty(len(uniques), dtype=np.int64)
+    for i, value in enumerate(uniques):
+        if value not in lookup:
+            lookup[value] = len(dictionary)
+            dictionary.append(value)
+        unique_codes[i] = lookup[value]
+    return unique_codes[codes] if len(codes) else np.empty(0, dtype=np.int64)
+
+
+class BucketStore:
+    """
+    In-memory view of the columnar master database.
+
+    `columns` maps column name to a 1-D array (memory-mapped when loaded from
+    disk); `dictionaries` maps dictionary name to its list of strings.
+    `counts` is the dense games-per-bucket grid indexed by bucket key, and
+    `summary` the running totals behind master_bucket_summary.json.
+    """
+
+    def __init__(self, columns: dict, dictionaries: dict, counts=None, indexes=True, summary=None):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        if counts is None:
+            counts = count_buckets(columns["bucket"])
+        self.counts = counts
+        self._lookups = {
+            name: {value: i for i, value in enumerate(values)}
+            for name, values in dictionaries.items()
+        }
+        self.indexes = StoreIndexes.build(self) if indexes else None
+        self.summary = summary if summary is not None else StoreSummary.build(self)
+
+    def __len__(self) -> int:
+        return len(self.columns["personId"])
+
+    @classmethod
+    def empty(cls, indexes=True) -> "BucketStore":
+        columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        return cls(columns, {"teams": [], "seasons": [], "players": []}, indexes=indexes)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, indexes=True) -> "BucketStore":
+        """
+        Build a store from a frame laid out like store_frame() output.
+        Pass indexes=False for partial stores that will only be merged.
+        """
+        store = cls.empty(indexes)
+        store.append_frame(frame)
+        return store
+
+    @classmethod
+    def from_master_data(cls, master_data: dict) -> "BucketStore":
+        """Build a store from the legacy nested master_bucket_database.json structure."""
+        rows = []
+        for bucket_str, bucket_info in master_data.items():
+            code = bucket_key_to_code(map(int, bucket_str.strip("()").split(", ")))
+            for game in bucket_info.get("games", []):
+                pts, reb, ast, stl, blk = (int(x) for x in str(game["stats"]).split("/"))
+                rows.append((
+                    int(game["personId"]), game["player"], game["date"], code,
+                    pts, reb, ast, stl, blk, game["team"], game["opponent"], game["season"],
+                ))
+        frame = pd.DataFrame(rows, columns=[
+            "personId", "player", "date", "bucket", "points", "rebounds", "assists",
+            "steals", "blocks", "team", "opponent", "season",
+        ])
+        frame["date"] = pd.to_datetime(frame["date"])
+        frame["gameId"] = 0  # Not recorded in the legacy JSON
+        return cls.from_frame(frame)
+
+    @classmethod
+    def merge(cls, stores: list, order=None) -> "BucketStore":
+        """
+        Concatenate stores in the given order. Dictionaries are merged in order
+        of first appearance, so the result matches building one store from the
+        concatenated frames. `order` optionally selects and permutes the merged
+        rows; the count grid is the sum of the stores' grids, less any rows
+        left out.
+        """
+        dictionaries = {name: [] for name in ("teams", "seasons", "players")}
+        lookups = {name: {} for name in dictionaries}
+        parts = {name: [] for name in COLUMN_DTYPES}
+        for store in stores:
+            remaps = {
+                name: _encode_strings(store.dictionaries[name], dictionaries[name], lookups[name])
+                for name in dictionaries
+            }
+            for name in COLUMN_DTYPES:
+                values = np.asarray(store.columns[name])
+                if name in DICTIONARY_COLUMNS:
+                    values = remaps[DICTIONARY_COLUMNS[name]][values]
+                parts[name].append(values.astype(COLUMN_DTYPES[name]))
+        columns = {
+            name: np.concatenate(values) if values else np.empty(0, dtype=COLUMN_DTYPES[name])
+            for name, values in parts.items()
+        }
+        counts = sum((np.asarray(store.counts) for store in stores), np.zeros(BUCKET_SHAPE, dtype=COUNT_DTYPE))
+        if order is not None:
+            dropped = np.ones(len(columns["bucket"]), dtype=bool)
+            dropped[order] = False
+            counts = counts - count_buckets(columns["bucket"][dropped])
+            columns = {name: values[order] for name, values in columns.items()}
+        return cls(columns, dictionaries, counts)
+
+    def append_frame(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Append rows laid out like store_frame() output.
+        Returns the row indices assigned to the new games.
+        """
+        start = len(self)
+        new_columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if name in DICTIONARY_COLUMNS:
+                dict_name = DICTIONARY_COLUMNS[name]
+                values = _encode_strings(frame[name], self.dictionaries[dict_name], self._lookups[dict_name])
+            elif name == "date":
+                values = pd.to_datetime(frame[name]).to_numpy().astype("datetime64[D]")
+            else:
+                values = frame[name].to_numpy()
+            new_columns[name] = np.concatenate([np.asarray(self.columns[name]), values.astype(dtype)])
+        self.columns = new_columns
+        new_rows = np.arange(start, len(self))
+        codes, added = np.unique(new_columns["bucket"][start:], return_counts=True)
+        before = np.asarray(self.counts).ravel()[codes]
+        self.counts = np.asarray(self.counts) + count_buckets(new_columns["bucket"][start:])
+        if self.indexes is not None:
+            self.indexes.extend(self, new_rows)
+        self.summary.record_insert(self, new_rows, before, before + added)
+        return new_rows
+
+    def append_new_games(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Append only the rows of `frame` that are not already stored (see
+        StoreIndexes.contains_games) and not repeated within `frame` itself.
+        Returns the row indices assigned to the new games.
+        """
+        frame = frame.drop_duplicates(subset=["personId", "date", "gameId"], keep="first")
+        dates = pd.to_datetime(frame["date"]).to_numpy().astype("datetime64[D]")
+        exists = self.indexes.contains_games(
+            self, frame["personId"].to_numpy(), dates, frame["gameId"].to_numpy()
+        )
+        return self.append_frame(frame[~exists])
+
+    @classmethod
+    def load(cls, store_dir: str = STORE_DIR, mmap: bool = True) -> "BucketStore":
+        """Load a store from disk, memory-mapping the column arrays by default."""
+        store_path = Path(store_dir)
+        with open(store_path / META_FILE, "r") as f:
+            meta = json.load(f)
+        columns = {}
+        for name in COLUMN_DTYPES:
+            path = store_path / f"{name}.npy"
+            if meta["rows"] == 0:
+                columns[name] = np.empty(0, dtype=COLUMN_DTYPES[name])
+            elif not path.exists() and name == "gameId":
+                # Stores written before gameId was tracked
+                columns[name] = np.zeros(meta["rows"], dtype=COLUMN_DTYPES[name])
+            else:
+                columns[name] = _load_array(path, mmap)
+        counts = load_bucket_counts(store_dir) if (store_path / COUNTS_FILE).exists() else None
+        # Stores written before the running summary was kept rebuild it here
+        summary = StoreSummary.from_meta(meta["summary"]) if "summary" in meta else None
+        store = cls(columns, meta["dictionaries"], counts, indexes=False, summary=summary)
+        store.indexes = StoreIndexes.load(store_dir, mmap) if meta["rows"] else None
+        if store.indexes is None:
+            store.indexes = StoreIndexes.build(store)
+        return store
+
+    def save(self, store_dir: str = STORE_DIR):
+        """Write every column and the metadata, replacing files atomically."""
+        store_path = Path(store_dir)
+        store_path.mkdir(parents=True, exist_ok=True)
+        for name, values in self.columns.items():
+            _save_array(store_path / f"{name}.npy", values)
+        _save_array(store_path / COUNTS_FILE, np.asarray(self.counts, dtype=COUNT_DTYPE))
+        self.indexes.save(store_dir)
+
+        meta = {
+            "version": STORE_VERSION,
+            "rows": len(self),
+            "bucket_shape": list(BUCKET_SHAPE),
+            "columns": {name: str(dtype) for name, dtype in COLUMN_DTYPES.items()},
+            "dictionaries": self.dictionaries,
+            "summary": self.summary.to_meta(),
+        }
+        tmp_meta = store_path / f"{META_FILE}.tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, store_path / META_FILE)
+
+    def person_rows(self, person_id: int) -> np.ndarray:
+        """Row indices of one personId, oldest first."""
+        return self.indexes.person_rows(person_id)
+
+    def season_rows(self, season: str) -> np.ndarray:
+        """Row indices of one season, oldest first."""
+        code = self.lookup("seasons", season)
+        return np.empty(0, dtype=np.int64) if code is None else self.indexes.season_rows(code)
+
+    def rows_since(self, date) -> np.ndarray:
+        """Row indices of games on or after `date`, oldest first."""
+        return self.indexes.rows_since(self, np.datetime64(date, "D"))
+
+    def bucket_rows(self, codes) -> np.ndarray:
+        """Row indices of one or more bucket codes, oldest first within each bucket."""
+        return self.indexes.bucket_rows(codes)
+
+    def buckets_with_count(self, low: int, high=None) -> np.ndarray:
+        """
+        Bucket codes holding exactly `low` games, or between `low` and `high`
+        games inclusive, fewest games first. Costs O(log buckets + result).
+        """
+        return self.indexes.buckets_with_count(low, high)
+
+    def lookup(self, dictionary: str, value: str):
+        """Return the code of a dictionary string, or None if it was never stored."""
+        return self._lookups[dictionary].get(value)
+
+    def decode(self, name: str, rows=None) -> np.ndarray:
+        """Return a dictionary-encoded column (optionally for selected rows) as strings."""
+        dictionary = np.asarray(self.dictionaries[DICTIONARY_COLUMNS[name]], dtype=object)
+        codes = self.columns[name] if rows is None else self.columns[name][rows]
+        return dictionary[codes]
+
+    def game_records(self, rows) -> list:
+        """Build game dicts in the master_bucket_database.json record format."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        c = self.columns
+        dates = np.datetime_as_string(c["date"][rows], unit="D")
+        players = self.decode("player", rows)
+        teams = self.decode("team", rows)
+        opponents = self.decode("opponent", rows)
+        seasons = self.decode("season", rows)
+        person_ids = c["personId"][rows].tolist()
+        stat_cols = [c[name][rows].tolist() for name in ("points", "rebounds", "assists", "steals", "blocks")]
+
+        records = []
+        for i in range(len(rows)):
+            records.append({
+                "player": players[i],
+                "date": str(dates[i]),
+                "stats": f"{stat_cols[0][i]}/{stat_cols[1][i]}/{stat_cols[2][i]}/{stat_cols[3][i]}/{stat_cols[4][i]}",
+                "team": teams[i],
+                "opponent": opponents[i],
+                "season": seasons[i],
+                "personId": person_ids[i],
+            })
+        return records
+
+    def rows_by_date_desc(self, rows) -> np.ndarray:
+        """Order row indices most recent first, keeping store order within a date."""
+        rows = np.asarray(rows, dtype=np.int64)
+        days = self.columns["date"][rows].astype(np.int64)
+        return rows[np.argsort(-days, kind="stable")]
+
+    def to_master_data(self) -> dict:
+        """Materialize the legacy nested bucket structure (games most recent first)."""
+        rows = self.rows_by_date_desc(np.arange(len(self)))
+        games = self.game_records(rows)
+        frame = pd.DataFrame({
+            "bucket": self.columns["bucket"][rows],
+            "season": self.columns["season"][rows],
+            "player": self.columns["player"][rows],
+        })
+
+        # Buckets, seasons and players all keep their order of first appearance
+        positions = frame.groupby("bucket", sort=False).indices
+        seasons = frame.drop_duplicates(["bucket", "season"]).groupby("bucket", sort=False)["season"].agg(list)
+        players = frame.drop_duplicates(["bucket", "player"]).groupby("bucket", sort=False)["player"].agg(list)
+        season_names = self.dictionaries["seasons"]
+        player_names = self.dictionaries["players"]
+
+        master_data: dict[str, dict] = {}
+        for code in seasons.index:
+            bucket_games = [games[i] for i in positions[code]]
+            master_data[bucket_code_to_str(code)] = {
+                "count": len(bucket_games),
+                "games": bucket_games,
+                "seasons": [season_names[s] for s in seasons[code]],
+                "players": [player_names[p] for p in players[code]],
+            }
+        return master_data
+
+    def export_json(self, master_file: str = "master_bucket_database.json"):
+        """Write the optional nested JSON export of the whole database."""
+        with open(master_file, "w") as f:
+            json.dump(self.to_master_data(), f)
+
+
+class StoreIndexes:
+    """
+    Secondary indexes over a BucketStore, persisted as index_*.npy files:
+
+    - date_order: every row sorted by date (ties by row)
+    - person_order / person_ids / person_offsets: rows grouped by personId
+      (then date), with person_order[offsets[i]:offsets[i + 1]] holding the
+      rows of person_ids[i]
+    - person_keys: the sorted (personId, day) game keys aligned with
+      person_order, probed by binary search for duplicate detection
+    - season_ranges: [start, stop) of each season code within date_order,
+      which works because seasons never overlap in time
+    - bucket_order / bucket_keys: rows grouped by bucket code (then date),
+      with the sorted (bucket, day) keys probed by binary search
+    - count_keys: every non-empty bucket packed as count * NUM_BUCKETS + code
+      and sorted, so the buckets with a given count (or count range) are one
+      contiguous slice
+    - names: lowercase normalized player name -> list of personIds
+    """
+
+    ARRAYS = (
+        "date_order", "person_order", "person_keys", "person_ids", "person_offsets", "season_ranges",
+        "bucket_order", "bucket_keys", "count_keys",
+    )
+    NAMES_FILE = "index_names.json"
+
+    def __init__(self, arrays: dict, names: dict):
+        self.arrays = arrays
+        self.names = names
+
+    @staticmethod
+    def _days(store: "BucketStore", rows=None) -> np.ndarray:
+        dates = store.columns["date"] if rows is None else store.columns["date"][rows]
+        return np.asarray(dates).astype(np.int64)
+
+    @staticmethod
+    def game_keys(person_ids, dates) -> np.ndarray:
+        """Pack (personId, day) into one int64: personId high, day number (< 2**20) low."""
+        days = np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+        return (np.asarray(person_ids).astype(np.int64) << 20) | days
+
+    @staticmethod
+    def _person_keys(store: "BucketStore", rows) -> np.ndarray:
+        return StoreIndexes.game_keys(store.columns["personId"][rows], store.columns["date"][rows])
+
+    @staticmethod
+    def _bucket_keys(store: "BucketStore", rows) -> np.ndarray:
+        """Pack (bucket, day) into one int64, the same way as game_keys."""
+        return StoreIndexes.game_keys(store.columns["bucket"][rows], store.columns["date"][rows])
+
+    @staticmethod
+    def _count_keys(codes, counts) -> np.ndarray:
+        return np.asarray(counts, dtype=np.int64) * NUM_BUCKETS + np.asarray(codes, dtype=np.int64)
+
+    @classmethod
+    def build(cls, store: "BucketStore") -> "StoreIndexes":
+        """Build every index from scratch."""
+        date_order = np.argsort(cls._days(store), kind="stable")
+        rows = np.arange(len(store))
+        person_keys = cls._person_keys(store, rows)
+        person_order = np.argsort(person_keys, kind="stable")
+        bucket_keys = cls._bucket_keys(store, rows)
+        bucket_order = np.argsort(bucket_keys, kind="stable")
+        counts = np.asarray(store.counts).ravel()
+        codes = np.flatnonzero(counts)
+        indexes = cls({
+            "date_order": date_order,
+            "person_order": person_order,
+            "person_keys": person_keys[person_order],
+            "bucket_order": bucket_order,
+            "bucket_keys": bucket_keys[bucket_order],
+            "count_keys": np.sort(cls._count_keys(codes, counts[codes])),
+        }, {})
+        indexes._refresh_groups(store)
+        indexes._add_names(store, rows)
+        return indexes
+
+    def extend(self, store: "BucketStore", new_rows: np.ndarray):
+        """Merge freshly appended rows into the sorted orders without re-sorting the history."""
+        if len(new_rows) == 0:
+            return
+        date_order = np.asarray(self.arrays["date_order"])
+        new_days = self._days(store, new_rows)
+        new_sorted = new_rows[np.argsort(new_days, kind="stable")]
+        positions = np.searchsorted(self._days(store, date_order), self._days(store, new_sorted), side="right")
+        self.arrays["date_order"] = np.insert(date_order, positions, new_sorted)
+
+        person_keys = np.asarray(self.arrays["person_keys"])
+        new_keys = self._person_keys(store, new_rows)
+        new_order = np.argsort(new_keys, kind="stable")
+        positions = np.searchsorted(person_keys, new_keys[new_order], side="right")
+        self.arrays["person_order"] = np.insert(np.asarray(self.arrays["person_order"]), positions, new_rows[new_order])
+        self.arrays["person_keys"] = np.insert(person_keys, positions, new_keys[new_order])
+
+        bucket_keys = np.asarray(self.arrays["bucket_keys"])
+        new_keys = self._bucket_keys(store, new_rows)
+        new_order = np.argsort(new_keys, kind="stable")
+        positions = np.searchsorted(bucket_keys, new_keys[new_order], side="right")
+        self.arrays["bucket_order"] = np.insert(np.asarray(self.arrays["bucket_order"]), positions, new_rows[new_order])
+        self.arrays["bucket_keys"] = np.insert(bucket_keys, positions, new_keys[new_order])
+
+        # Move every touched bucket to its new count class
+        codes, added = np.unique(store.columns["bucket"][new_rows], return_counts=True)
+        after = np.asarray(store.counts).ravel()[codes]
+        before = after - added
+        count_keys = np.asarray(self.arrays["count_keys"])
+        old_keys = self._count_keys(codes[before > 0], before[before > 0])
+        count_keys = np.delete(count_keys, np.searchsorted(count_keys, old_keys))
+        new_keys = np.sort(self._count_keys(codes, after))
+        self.arrays["count_keys"] = np.insert(count_keys, np.searchsorted(count_keys, new_keys), new_keys)
+
+        self._refresh_groups(store)
+        self._add_names(store, new_rows)
+
+    def _refresh_groups(self, store: "BucketStore"):
+        """Recompute personId offsets and season ranges from the sorted orders (linear time)."""
+        person_ids = np.asarray(self.arrays["person_keys"]) >> 20
+        starts = np.flatnonzero(np.r_[True, person_ids[1:] != person_ids[:-1]]) if len(person_ids) else np.empty(0, dtype=np.int64)
+        self.arrays["person_ids"] = person_ids[starts].astype(np.int64)
+        self.arrays["person_offsets"] = np.r_[starts, len(person_ids)].astype(np.int64)
+
+        seasons = np.asarray(store.columns["season"])[self.arrays["date_order"]].astype(np.int64)
+        num_seasons = len(store.dictionaries["seasons"])
+        positions = np.arange(len(seasons))
+        season_ranges = np.zeros((num_seasons, 2), dtype=np.int64)
+        if len(seasons):
+            first = np.full(num_seasons, len(seasons), dtype=np.int64)
+            last = np.full(num_seasons, -1, dtype=np.int64)
+            np.minimum.at(first, seasons, positions)
+            np.maximum.at(last, seasons, positions)
+            present = last >= 0
+            season_ranges[present, 0] = first[present]
+            season_ranges[present, 1] = last[present] + 1
+        self.arrays["season_ranges"] = season_ranges
+
+    def _add_names(self, store: "BucketStore", rows: np.ndarray):
+        pairs = pd.DataFrame({
+            "player": np.asarray(store.columns["player"][rows]),
+            "personId": np.asarray(store.columns["personId"][rows]),
+        }).drop_duplicates()
+        players = store.dictionaries["players"]
+        for player_code, person_id in zip(pairs["player"].tolist(), pairs["personId"].tolist()):
+            person_ids = self.names.setdefault(players[player_code].lower(), [])
+            if person_id not in person_ids:
+                person_ids.append(person_id)
+
+    def contains_games(self, store: "BucketStore", person_ids, dates, game_ids=None) -> np.ndarray:
+        """
+        Boolean mask of which (personId, date[, gameId]) games are already stored.
+        Costs O(log n) per probed game. A gameId of 0 means unknown; two games
+        only count as different on the same day if both carry different ids.
+        """
+        keys = self.game_keys(person_ids, dates)
+        sorted_keys = self.arrays["person_keys"]
+        left = np.searchsorted(sorted_keys, keys, side="left")
+        right = np.searchsorted(sorted_keys, keys, side="right")
+        exists = right > left
+        if game_ids is None:
+            return exists
+
+        game_ids = np.asarray(game_ids)
+        stored_ids = store.columns["gameId"]
+        for i in np.flatnonzero(exists & (game_ids != 0)):
+            rows = self.arrays["person_order"][left[i]:right[i]]
+            existing = stored_ids[rows]
+            exists[i] = bool(np.any((existing == 0) | (existing == game_ids[i])))
+        return exists
+
+    def person_rows(self, person_id: int) -> np.ndarray:
+        person_ids = self.arrays["person_ids"]
+        i = int(np.searchsorted(person_ids, person_id))
+        if i == len(person_ids) or person_ids[i] != person_id:
+            return np.empty(0, dtype=np.int64)
+        offsets = self.arrays["person_offsets"]
+        return np.asarray(self.arrays["person_order"][offsets[i]:offsets[i + 1]])
+
+    def bucket_rows(self, codes) -> np.ndarray:
+        """Rows of the given bucket codes, bucket by bucket and oldest first within each."""
+        codes = np.atleast_1d(np.asarray(codes, dtype=np.int64))
+        bucket_keys = self.arrays["bucket_keys"]
+        starts = np.searchsorted(bucket_keys, codes << 20)
+        stops = np.searchsorted(bucket_keys, (codes + 1) << 20)
+        lengths = stops - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        # Concatenated ranges [start, stop) without a Python loop over buckets
+        offsets = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+        return np.asarray(self.arrays["bucket_order"])[np.arange(lengths.sum()) + offsets]
+
+    def buckets_with_count(self, low: int, high=None) -> np.ndarray:
+        """Bucket codes whose count is in [low, high] (exactly low if high is None), by count then code."""
+        high = low if high is None else high
+        count_keys = self.arrays["count_keys"]
+        start = np.searchsorted(count_keys, low * NUM_BUCKETS)
+        stop = np.searchsorted(count_keys, (high + 1) * NUM_BUCKETS)
+        return np.asarray(count_keys[start:stop]) % NUM_BUCKETS
+
+    def season_rows(self, season_code: int) -> np.ndarray:
+        if season_code >= len(self.arrays["season_ranges"]):
+            return np.empty(0, dtype=np.int64)
+        start, stop = self.arrays["season_ranges"][season_code]
+        return np.asarray(self.arrays["date_order"][start:stop])
+
+    def rows_since(self, store: "BucketStore", date: np.datetime64) -> np.ndarray:
+        date_order = self.arrays["date_order"]
+        dates = store.columns["date"]
+        start = bisect.bisect_left(date_order, date, key=lambda row: dates[row])
+        return np.asarray(date_order[start:])
+
+    def person_ids_for_name(self, player_name: str) -> list:
+        return self.names.get(player_name.lower(), [])
+
+    def save(self, store_dir: str = STORE_DIR):
+        store_path = Path(store_dir)
+        for name in self.ARRAYS:
+            _save_array(store_path / f"index_{name}.npy", self.arrays[name])
+        tmp_names = store_path / f"{self.NAMES_FILE}.tmp"
+        with open(tmp_names, "w") as f:
+            json.dump(self.names, f)
+        os.replace(tmp_names, store_path / self.NAMES_FILE)
+
+    @classmethod
+    def load(cls, store_dir: str = STORE_DIR, mmap: bool = True):
+        """Load persisted indexes, or return None if any file is missing."""
+        store_path = Path(store_dir)
+        paths = {name: store_path / f"index_{name}.npy" for name in cls.ARRAYS}
+        if not (store_path / cls.NAMES_FILE).exists() or not all(p.exists() for p in paths.values()):
+            return None
+        with open(store_path / cls.NAMES_FILE, "r") as f:
+            names = json.load(f)
+        return cls({name: _load_array(path, mmap) for name, path in paths.items()}, names)
+
+
+class StoreSummary:
+    """
+    Running summary of a BucketStore, persisted in meta.json:
+
+    - total_games
+    - histogram: bucket count -> number of buckets with exactly that count
+    - date_start / date_end: range of game dates (date_end is the latest game)
+    - seasons: every season with at least one game
+
+    record_insert() updates it from the inserted rows and the touched
+    buckets' counts alone, so keeping it current costs O(new games).
+    """
+
+    def __init__(self, total_games: int, histogram: dict, date_start, date_end, seasons: list):
+        self.total_games = total_games
+        self.histogram = histogram
+        self.date_start = date_start
+        self.date_end = date_end
+        self.seasons = seasons
+
+    @classmethod
+    def build(cls, store: "BucketStore") -> "StoreSummary":
+        """Compute the summary from scratch."""
+        summary = cls(0, {}, None, None, [])
+        counts = np.asarray(store.counts).ravel()
+        values, buckets = np.unique(counts[counts > 0], return_counts=True)
+        summary.histogram = dict(zip(values.tolist(), buckets.tolist()))
+        summary.total_games = len(store)
+        summary._add_games(store, np.arange(len(store)))
+        return summary
+
+    def record_insert(self, store: "BucketStore", new_rows, before, after):
+        """
+        Account for freshly appended rows. `before` and `after` are the counts
+        of every touched bucket before and after the insert.
+        """
+        for old, new in zip(np.asarray(before).tolist(), np.asarray(after).tolist()):
+            if old:
+                self.histogram[old] -= 1
+                if not self.histogram[old]:
+                    del self.histogram[old]
+            self.histogram[new] = self.histogram.get(new, 0) + 1
+        self.total_games += len(new_rows)
+        self._add_games(store, new_rows)
+
+    def _add_games(self, store: "BucketStore", rows):
+        if len(rows) == 0:
+            return
+        dates = store.columns["date"][rows]
+        start, end = str(dates.min()), str(dates.max())
+        self.date_start = start if self.date_start is None else min(self.date_start, start)
+        self.date_end = end if self.date_end is None else max(self.date_end, end)
+        seasons = set(self.seasons)
+        seasons.update(store.dictionaries["seasons"][code] for code in np.unique(store.columns["season"][rows]).tolist())
+        self.seasons = sorted(seasons)
+
+    @property
+    def total_buckets(self) -> int:
+        return sum(self.histogram.values())
+
+    def count_buckets_between(self, low: int, high=None) -> int:
+        """Number of buckets whose count is in [low, high] (no upper bound if high is None)."""
+        return sum(n for count, n in self.histogram.items() if count >= low and (high is None or count <= high))
+
+    def bucket_distribution(self) -> dict:
+        """Same layout as bucket_distribution(counts), without touching the grid."""
+        return {
+            "1": self.histogram.get(1, 0),
+            "2": self.histogram.get(2, 0),
+            "3-5": self.count_buckets_between(3, 5),
+            "6-10": self.count_buckets_between(6, 10),
+            "11+": self.count_buckets_between(11),
+        }
+
+    def to_dict(self) -> dict:
+        """The statistics written to master_bucket_summary.json."""
+        return {
+            "total_games": self.total_games,
+            "total_buckets": self.total_buckets,
+            "total_seasons": len(self.seasons),
+            "date_range": {"start": self.date_start, "end": self.date_end},
+            "uniqorn_count": self.histogram.get(1, 0),
+            "two_occurrence_count": self.histogram.get(2, 0),
+            "bucket_distribution": self.bucket_distribution(),
+        }
+
+    def to_meta(self) -> dict:
+        return {
+            "total_games": self.total_games,
+            "histogram": {str(count): n for count, n in sorted(self.histogram.items())},
+            "date_start": self.date_start,
+            "date_end": self.date_end,
+            "seasons": self.seasons,
+        }
+
+    @classmethod
+    def from_meta(cls, meta: dict) -> "StoreSummary":
+        histogram = {int(count): n for count, n in meta["histogram"].items()}
+        return cls(meta["total_games"], histogram, meta["date_start"], meta["date_end"], meta["seasons"])
+
+
+def write_summary(store: BucketStore, summary_file: str = SUMMARY_FILE) -> dict:
+    """Write master_bucket_summary.json from the store's running summary and return it."""
+    summary = store.summary.to_dict()
+    summary["last_updated"] = datetime.now().isoformat()
+    with open(summary_file, "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def store_exists(store_dir: str = STORE_DIR) -> bool:
+    return (Path(store_dir) / META_FILE).exists()
+
+
+def count_buckets(bucket_codes) -> np.ndarray:
+    """Dense games-per-bucket grid of shape BUCKET_SHAPE for an array of bucket codes."""
+    counts = np.bincount(np.asarray(bucket_codes, dtype=np.int64), minlength=NUM_BUCKETS)
+    return counts.astype(COUNT_DTYPE).reshape(BUCKET_SHAPE)
+
+
+def load_bucket_counts(store_dir: str = STORE_DIR) -> np.ndarray:
+    """
+    Memory-map only the bucket count grid, without touching the game columns.
+    Index it with a bucket key tuple, or use .ravel()[codes] for bucket codes.
+    """
+    return np.load(Path(store_dir) / COUNTS_FILE, mmap_mode="r")
+
+
+def bucket_distribution(counts) -> dict:
+    """Bucket count histogram in the master_bucket_summary.json layout."""
+    counts = np.asarray(counts).ravel()
+    return {
+        "1": int(np.count_nonzero(counts == 1)),
+        "2": int(np.count_nonzero(counts == 2)),
+        "3-5": int(np.count_nonzero((counts >= 3) & (counts <= 5))),
+        "6-10": int(np.count_nonzero((counts >= 6) & (counts <= 10))),
+        "11+": int(np.count_nonzero(counts >= 11)),
+    }
@@ -1,207 +1,225 @@
 import json
-import pandas as pd
+import numpy as np
+from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any, Optional
 
+from data_utils import BUCKET_SHAPE, bucket_code_to_key, bucket_code_to_str, bucket_key_to_code
+from master_bucket_store import (
+    STORE_DIR,
+    BucketStore,
+    load_bucket_counts,
+    store_exists,
+)
+
+def _in_grid(bucket_key) -> bool:
+    """Whether bucket_key is a valid (points, rebounds, assists, steals, blocks) bin tuple."""
+    key = tuple(bucket_key)
+    return len(key) == len(BUCKET_SHAPE) and all(0 <= int(k) < n for k, n in zip(key, BUCKET_SHAPE))
+
+
 class MasterBucketDatabase:
     """
     Ultra-fast query interface for the master bucket database.
-    All operations are O(1) or O(log n) instead of O(n).
+    Backed by the memory-mapped columnar store in master_bucket_store/.
     """
-    
-    def __init__(self, master_file: str = "master_bucket_database.json"):
+
+    def __init__(self, store_dir: str = STORE_DIR, master_file: str = "master_bucket_database.json"):
         """Load the master bucket database."""
+        self.store_dir = store_dir
         self.master_file = master_file
         self.load_database()
-    
+
     def load_database(self):
-        """Load the master database from file."""
-        try:
+        """Load the columnar store, migrating a legacy JSON database on first use."""
+        self._data = None
+        if store_exists(self.store_dir):
+            self.store = BucketStore.load(self.store_dir)
+        elif Path(self.master_file).exists():
+            print(f"🔄 Migrating {self.master_file} to {self.store_dir}/...")
             with open(self.master_file, "r") as f:
-                self.data = json.load(f)
-            print(f"✅ Loaded {len(self.data):,} buckets from master database")
-        except FileNotFoundError:
-            print(f"❌ Master database {self.master_file} not found!")
-            self.data = {}
-    
+                self.store = BucketStore.from_master_data(json.load(f))
+            self.store.save(self.store_dir)
+        else:
+            print(f"❌ Master database {self.store_dir} not found!")
+            self.store = BucketStore.empty()
+            return
+        print(f"✅ Loaded {len(self.store):,} games from master database")
+
+    @property
+    def data(self) -> Dict[str, Dict]:
+        """Legacy nested bucket dict, materialized on first access. Avoid on hot paths."""
+        if self._data is None:
+            self._data = self.store.to_master_data()
+        return self._data
+
+    def _bucket_counts(self) -> np.ndarray:
+        """Bucket count grid flattened so it can be indexed by bucket code."""
+        return self.store.counts.ravel()
+
+    def _season_code(self, season: str) -> Optional[int]:
+        return self.store.lookup("seasons", season)
+
+    def _bucket_rows(self, code: int) -> np.ndarray:
+        """Row indices of one bucket, most recent first."""
+        return self.store.rows_by_date_desc(self.store.bucket_rows(code))
+
+    def _records(self, rows: np.ndarray) -> List[Dict]:
+        """Game records for rows, sorted by date (most recent first)."""
+        return self.store.game_records(self.store.rows_by_date_desc(rows))
+
     def get_bucket_info(self, bucket_key: Tuple[int, int, int, int, int]) -> Optional[Dict]:
         """Get complete information for a specific bucket."""
-        bucket_str = f"({', '.join(map(str, bucket_key))})"
-        return self.data.get(bucket_str)
-    
+        if not _in_grid(bucket_key):
+            return None
+        rows = self._bucket_rows(bucket_key_to_code(bucket_key))
+        if len(rows) == 0:
+            return None
+        games = self.store.game_records(rows)
+        return {
+            "count": len(games),
+            "games": games,
+            "seasons": list(dict.fromkeys(g["season"] for g in games)),
+            "players": list(dict.fromkeys(g["player"] for g in games)),
+        }
+
     def get_bucket_count(self, bucket_key: Tuple[int, int, int, int, int]) -> int:
-        """Get the count of games for a specific bucket."""
-        bucket_info = self.get_bucket_info(bucket_key)
-        return bucket_info['count'] if bucket_info else 0
-    
+        """Get the count of games for a specific bucket (0 for keys outside the bucket grid)."""
+        if not _in_grid(bucket_key):
+            return 0
+        return int(self.store.counts[tuple(bucket_key)])
+
     def get_bucket_games(self, bucket_key: Tuple[int, int, int, int, int]) -> List[Dict]:
         """Get all games for a specific bucket."""
-        bucket_info = self.get_bucket_info(bucket_key)
-        return bucket_info['games'] if bucket_info else []
-    
+        if not _in_grid(bucket_key):
+            return []
+        return self.store.game_records(self._bucket_rows(bucket_key_to_code(bucket_key)))
+
     def get_uniqorn_games(self, season: Optional[str] = None) -> List[Dict]:
         """Get all Uniqorn games (bucket count = 1)."""
-        uniqorn_games = []
-        for bucket_info in self.data.values():
-            if bucket_info['count'] == 1:
-                games = bucket_info['games']
-                if season is None or (games and games[0]['season'] == season):
-                    uniqorn_games.extend(games)
-        
-        # Sort by date (most recent first)
-        uniqorn_games.sort(key=lambda x: x['date'], reverse=True)
-        return uniqorn_games
-    
+        rows = np.sort(self.store.bucket_rows(self.store.buckets_with_count(1)))
+        if season is not None:
+            rows = rows[self.store.columns["season"][rows] == self._season_code(season)]
+
+        # Sorted by date (most recent first)
+        return self._records(rows)
+
     def get_two_occurrence_games(self, season: Optional[str] = None) -> List[Dict]:
         """Get all games with exactly 2 occurrences."""
-        two_occurrence_games = []
-        for bucket_info in self.data.values():
-            if bucket_info['count'] == 2:
-                games = bucket_info['games']
-                if season is None or (games and games[0]['season'] == season):
-                    two_occurrence_games.extend(games)
-        
-        # Sort by date (most recent first)
-        two_occurrence_games.sort(key=lambda x: x['date'], reverse=True)
-        return two_occurrence_games
-    
+        buckets = self.store.columns["bucket"]
+        rows = np.sort(self.store.bucket_rows(self.store.buckets_with_count(2)))
+        if season is not None:
+            # A bucket belongs to the season of its most recent game
+            rows = self.store.rows_by_date_desc(rows)
+            _, first = np.unique(buckets[rows], return_index=True)
+            latest_rows = rows[first]
+            season_code = self._season_code(season)
+            keep = buckets[latest_rows][self.store.columns["season"][latest_rows] == season_code]
+            rows = rows[np.isin(buckets[rows], keep)]
+
+        # Sorted by date (most recent first)
+        return self._records(rows)
+
     def get_recent_games(self, days: int = 7) -> List[Dict]:
         """Get all games from the last N days."""
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        recent_games = []
-        
-        for bucket_info in self.data.values():
-            for game in bucket_info['games']:
-                if game['date'] >= cutoff_date:
-                    recent_games.append(game)
-        
-        # Sort by date (most recent first)
-        recent_games.sort(key=lambda x: x['date'], reverse=True)
-        return recent_games
-    
+        rows = self.store.rows_since(cutoff_date)
+
+        # Sorted by date (most recent first)
+        return self._records(rows)
+
     def get_season_games(self, season: str) -> List[Dict]:
         """Get all games from a specific season."""
-        season_games = []
-        
-        for bucket_info in self.data.values():
-            for game in bucket_info['games']:
-                if game['season'] == season:
-                    season_games.append(game)
-        
-        # Sort by date (most recent first)
-        season_games.sort(key=lambda x: x['date'], reverse=True)
-        return season_games
-    
+        rows = self.store.season_rows(season)
+
+        # Sorted by date (most recent first)
+        return self._records(rows)
+
     def get_player_games(self, player_name: str) -> List[Dict]:
         """Get all games for a specific player."""
-        player_games = []
-        
-        for bucket_info in self.data.values():
-            for game in bucket_info['games']:
-                if game['player'].lower() == player_name.lower():
-                    player_games.append(game)
-        
-        # Sort by date (most recent first)
-        player_games.sort(key=lambda x: x['date'], reverse=True)
-        return player_games
-    
+        person_ids = self.store.indexes.person_ids_for_name(player_name)
+        rows = [self.store.person_rows(pid) for pid in person_ids]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+        # Sorted by date (most recent first)
+        return self._records(rows)
+
+    def get_person_games(self, person_id: int) -> List[Dict]:
+        """Get all games for a specific personId."""
+        # Sorted by date (most recent first)
+        return self._records(self.store.person_rows(person_id))
+
     def get_bucket_distribution(self) -> Dict[str, int]:
         """Get distribution of bucket counts."""
-        distribution = {"1": 0, "2": 0, "3-5": 0, "6-10": 0, "11+": 0}
-        
-        for bucket_info in self.data.values():
-            count = bucket_info['count']
-            if count == 1:
-                distribution["1"] += 1
-            elif count == 2:
-                distribution["2"] += 1
-            elif 3 <= count <= 5:
-                distribution["3-5"] += 1
-            elif 6 <= count <= 10:
-                distribution["6-10"] += 1
-            else:
-                distribution["11+"] += 1
-        
-        return distribution
-    
+        return self.store.summary.bucket_distribution()
+
     def get_rarest_buckets(self, limit: int = 10) -> List[Dict]:
         """Get the rarest buckets (lowest counts)."""
-        rare_buckets = []
-        
-        for bucket_str, bucket_info in self.data.items():
-            if bucket_info['count'] <= 5:  # Only include rare buckets
-                rare_buckets.append({
-                    'bucket_key': bucket_str,
-                    'count': bucket_info['count'],
-                    'games': bucket_info['games'][:3]  # Show first 3 games
-                })
-        
-        # Sort by count (ascending) and take top results
-        rare_buckets.sort(key=lambda x: x['count'])
-        return rare_buckets[:limit]
-    
-    def search_by_stats(self, points_range: Tuple[int, int], 
+        counts = self._bucket_counts()
+        rare_codes = self.store.buckets_with_count(1, 5)[:limit]  # Only include rare buckets
+
+        return [
+            {
+                'bucket_key': bucket_code_to_str(code),
+                'count': int(counts[code]),
+                'games': self.store.game_records(self._bucket_rows(code)[:3])  # Show first 3 games
+            }
+            for code in rare_codes
+        ]
+
+    def search_by_stats(self, points_range: Tuple[int, int],
                         assists_range: Tuple[int, int],
                         rebounds_range: Tuple[int, int],
                         blocks_range: Tuple[int, int],
                         steals_range: Tuple[int, int]) -> List[Dict]:
         """Search for buckets within specific stat ranges."""
         matching_buckets = []
-        
-        for bucket_str, bucket_info in self.data.items():
-            # Parse bucket key
-            bucket_key = tuple(map(int, bucket_str.strip('()').split(', ')))
-            
+        counts = self._bucket_counts()
+
+        for code in np.flatnonzero(counts):
+            bucket_key = bucket_code_to_key(code)
+
             points_bin, assists_bin, rebounds_bin, blocks_bin, steals_bin = bucket_key
-            
+
             # Convert bin to approximate stat range (this is approximate)
             points_est = points_bin * 5  # Rough estimate
             assists_est = assists_bin * 3
             rebounds_est = rebounds_bin * 5
             blocks_est = blocks_bin * 2
             steals_est = steals_bin * 2
-            
+
             # Check if within ranges
             if (points_range[0] <= points_est <= points_range[1] and
                 assists_range[0] <= assists_est <= assists_range[1] and
                 rebounds_range[0] <= rebounds_est <= rebounds_range[1] and
                 blocks_range[0] <= blocks_est <= blocks_range[1] and
                 steals_range[0] <= steals_est <= steals_range[1]):
-                
+
                 matching_buckets.append({
                     'bucket_key': bucket_key,
-                    'bucket_str': bucket_str,
-                    'count': bucket_info['count'],
-                    'games': bucket_info['games']
+                    'bucket_str': bucket_code_to_str(code),
+                    'count': int(counts[code]),
+                    'games': self.store.game_records(self._bucket_rows(code))
                 })
-        
+
         # Sort by count (ascending)
         matching_buckets.sort(key=lambda x: x['count'])
         return matching_buckets
-    
+
     def get_statistics(self) -> Dict:
-        """Get comprehensive statistics about the database."""
-        total_games = sum(bucket['count'] for bucket in self.data.values())
-        uniqorn_count = len([b for b in self.data.values() if b['count'] == 1])
-        two_occurrence_count = len([b for b in self.data.values() if b['count'] == 2])
-        
-        # Get date range
-        all_dates = []
-        for bucket_info in self.data.values():
-            for game in bucket_info['games']:
-                all_dates.append(game['date'])
-        
+        """Get comprehensive statistics about the database (served from the running summary)."""
+        summary = self.store.summary.to_dict()
+        total_games = summary['total_games']
+        uniqorn_count = summary['uniqorn_count']
+
         return {
             'total_games': total_games,
-            'total_buckets': len(self.data),
+            'total_buckets': summary['total_buckets'],
             'uniqorn_count': uniqorn_count,
-            'two_occurrence_count': two_occurrence_count,
+            'two_occurrence_count': summary['two_occurrence_count'],
             'uniqorn_percentage': (uniqorn_count / total_games * 100) if total_games > 0 else 0,
-            'date_range': {
-                'start': min(all_dates) if all_dates else None,
-                'end': max(all_dates) if all_dates else None
-            },
-            'bucket_distribution': self.get_bucket_distribution()
+            'date_range': summary['date_range'],
+            'bucket_distribution': summary['bucket_distribution']
         }
 
 # Convenience functions for backward compatibility
@@ -216,6 +234,11 @@ def get_recent_games(days: int = 7) -> List[Dict]:
     return db.get_recent_games(days)
 
 def get_bucket_count(bucket_key: Tuple[int, int, int, int, int]) -> int:
-    """Get bucket count using the master database."""
-    db = MasterBucketDatabase()
-    return db.get_bucket_count(bucket_key)
+    """Get bucket count from the count grid alone, without loading any games (0 outside the grid)."""
+    if not _in_grid(bucket_key):
+        return 0
+    return int(load_bucket_counts()[tuple(bucket_key)])
+
+def is_uniqorn_bucket(bucket_key: Tuple[int, int, int, int, int]) -> bool:
+    """Check whether a bucket holds exactly one game, using only the count grid."""
+    return get_bucket_count(bucket_key) == 1
@@ -0,0 +1,194 @@
+"""
+Multi-season historical backfill from the NBA API.
+
+Pulls the player LeagueGameLog of many seasons through a thread pool. All
+threads share one token-bucket rate limiter, so throughput is bounded by
+REQUESTS_PER_SECOND rather than by serial sleeps. Failed requests are retried
+with exponential backoff. Each finished season is written straight into the
+cleaned, bucketed, season-assigned Parquet layout used by stats_cache
+(nba_api_backfill/season=YYYY-YY/part-00000.parquet) and recorded in
+progress.json, so an interrupted backfill resumes with the seasons it has
+not finished yet.
+
+BASE_URL can point at a local stand-in server that answers
+/leaguegamelog with the same JSON as stats.nba.com.
+"""
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import requests
+from nba_api.stats.library.http import STATS_HEADERS
+
+from data_utils import CSV_DTYPES, create_buckets
+from nba_api_data import format_to_pipeline_structure
+from season_calendar import SEASONS, assign_seasons
+from stats_cache import iter_season_partitions, parquet_available, write_season_partition
+
+BASE_URL = "https://stats.nba.com/stats"
+BACKFILL_DIR = "nba_api_backfill"
+PROGRESS_FILE = "progress.json"
+
+WORKERS = 4
+REQUESTS_PER_SECOND = 0.5  # Shared across all workers
+BURST = 2
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 2.0  # Doubles on every retry, plus jitter
+REQUEST_TIMEOUT = 30
+
+# Responses worth retrying; anything else in 4xx is a bad request
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _load_progress(backfill_dir) -> dict:
+    path = Path(backfill_dir) / PROGRESS_FILE
+    if not path.exists():
+        return {"completed": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_progress(backfill_dir, progress: dict):
+    path = Path(backfill_dir) / PROGRESS_FILE
+    tmp_path = path.with_name(f"{PROGRESS_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(progress, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fetch_season_log(season, limiter, session, base_url=BASE_URL) -> pd.DataFrame:
+    """Fetch one season's player LeagueGameLog, retrying with backoff."""
+    params = {
+        "Counter": 0,
+        "DateFrom": "",
+        "DateTo": "",
+        "Direction": "ASC",
+        "LeagueID": "00",
+        "PlayerOrTeam": "P",
+        "Season": season,
+        "SeasonType": "Regular Season",
+        "Sorter": "DATE",
+    }
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = session.get(f"{base_url}/leaguegamelog", params=params, timeout=REQUEST_TIMEOUT)
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                result = response.json()["resultSets"][0]
+                return pd.DataFrame(result["rowSet"], columns=result["headers"])
+            error = f"HTTP {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = str(e)
+        if attempt == MAX_RETRIES:
+            raise RuntimeError(f"{season}: giving up after {MAX_RETRIES + 1} attempts ({error})")
+        delay = BACKOFF_SECONDS * 2 ** attempt * (1 + random.random())
+        print(f"   ⚠️ {season}: {error}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def clean_season_log(raw_df, season) -> pd.DataFrame:
+    """Format, bucket and season-assign a raw game log like the Parquet cache rows."""
+    df = format_to_pipeline_structure(raw_df)
+    if df.empty:
+        return df
+    df = df.drop_duplicates(subset=["personId", "gameId"], keep="first")
+    # The ids are already int64 here; only the CSV reads them nullable
+    df = df.astype({col: CSV_DTYPES[col] for col in df.columns if CSV_DTYPES.get(col) not in (None, str, "Int64")})
+    df = create_buckets(df, verbose=False)
+    df = df.assign(season=assign_seasons(df["gameDateTimeEst"]))
+    return df[df["season"] == season]
+
+
+def backfill(seasons=None, workers=WORKERS, base_url=BASE_URL, backfill_dir=BACKFILL_DIR, force=False):
+    """
+    Backfill `seasons` (default: every season in the calendar) into backfill_dir.
+    Seasons already listed in progress.json are skipped unless force=True.
+    """
+    if not parquet_available():
+        print("❌ pyarrow is required to write the backfill")
+        return
+    start_time = time.time()
+    seasons = list(SEASONS if seasons is None else seasons)
+    Path(backfill_dir).mkdir(parents=True, exist_ok=True)
+    progress = _load_progress(backfill_dir)
+    pending = [s for s in seasons if force or s not in progress["completed"]]
+
+    print("📡 NBA API Historical Backfill")
+    print("=" * 60)
+    print(f"   {len(seasons) - len(pending)} of {len(seasons)} seasons already done, {len(pending)} to fetch")
+    print(f"   {workers} workers sharing {REQUESTS_PER_SECOND} requests/s")
+
+    limiter = TokenBucket(REQUESTS_PER_SECOND, BURST)
+    progress_lock = threading.Lock()
+    session = requests.Session()
+    session.headers.update(STATS_HEADERS)
+
+    def run(season):
+        df = clean_season_log(fetch_season_log(season, limiter, session, base_url), season)
+        if df.empty:
+            # An empty (or throttled) resultSet is not a finished season; leave it for the next run
+            raise RuntimeError("response has no games")
+        write_season_partition(backfill_dir, season, 0, df)
+        with progress_lock:
+            progress["completed"][season] = {"rows": len(df), "finished": datetime.now().isoformat()}
+            _save_progress(backfill_dir, progress)
+        return len(df)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, season): season for season in pending}
+        for future in as_completed(futures):
+            season = futures[future]
+            try:
+                print(f"   ✅ {season}: {future.result():,} games")
+            except Exception as e:
+                failed.append(season)
+                print(f"   ❌ {season}: {e}")
+
+    print("=" * 60)
+    print(f"✅ Backfill finished in {time.time() - start_time:.2f}s")
+    print(f"   Seasons completed: {len(progress['completed'])}/{len(seasons)}")
+    if failed:
+        print(f"   Failed (re-run to resume): {', '.join(sorted(failed))}")
+    print(f"   Output: {backfill_dir}/")
+    print("=" * 60)
+
+
+def iter_backfilled_statistics(seasons=None, backfill_dir=BACKFILL_DIR):
+    """Yield the backfilled season frames, in the same layout as stats_cache.iter_player_statistics."""
+    yield from iter_season_partitions(backfill_dir, seasons)
+
+
+if __name__ == "__main__":
+    backfill()
@@ -7,9 +7,16 @@ OPTIMIZED: Uses leaguegamelog endpoint to fetch ALL players' games in ONE API ca
 """
 
 from nba_api.stats.endpoints import leaguegamelog
+import gzip
+import json
+import os
+import numpy as np
 import pandas as pd
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
+
+from season_calendar import REGULAR_SEASONS
 
 # Rate limiting settings
 REQUEST_DELAY = 1.5  # seconds between API calls (increased for NBA API compliance)
@@ -17,33 +24,121 @@ REQUEST_DELAY = 1.5  # seconds between API calls (increased for NBA API complian
 # Current season
 CURRENT_SEASON = "2025-26"
 
+# On-disk response cache (gzipped JSON, one file per endpoint/season/date window).
+# Windows ending more than RECENT_DAYS ago are complete and cached permanently;
+# windows touching recent dates expire after RECENT_CACHE_TTL seconds and are
+# deleted once expired, since the nightly window's start moves every day.
+CACHE_DIR = "nba_api_cache"
+RECENT_DAYS = 3
+RECENT_CACHE_TTL = 6 * 60 * 60
+
+# Endpoint used for game logs; swap in a stand-in with the same interface to run offline
+GAMELOG_ENDPOINT = leaguegamelog.LeagueGameLog
+
+
+def _api_date(date):
+    """LeagueGameLog date filters take MM/DD/YYYY."""
+    return pd.to_datetime(date).strftime('%m/%d/%Y')
+
+
+def _cache_path(endpoint_name, season, date_from, date_to):
+    date_from = pd.to_datetime(date_from).strftime('%Y-%m-%d') if date_from else 'start'
+    date_to = pd.to_datetime(date_to).strftime('%Y-%m-%d') if date_to else 'end'
+    window = f"{date_from}_{date_to}"
+    return Path(CACHE_DIR) / f"{endpoint_name}_{season}_{window}.json.gz"
+
+
+def _cache_ttl(season, date_to):
+    """Seconds a cached window stays valid, or None if its dates are complete."""
+    last_date = pd.to_datetime(date_to) if date_to else None
+    if season in REGULAR_SEASONS:
+        season_end = pd.to_datetime(REGULAR_SEASONS[season][1])
+        last_date = season_end if last_date is None else min(last_date, season_end)
+    if last_date is not None and last_date < pd.Timestamp.now().normalize() - timedelta(days=RECENT_DAYS):
+        return None
+    return RECENT_CACHE_TTL
+
 
-def fetch_all_games_for_season(season=CURRENT_SEASON):
+def _read_cached_response(path, ttl):
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        cached = json.load(f)
+    if ttl is not None and time.time() - cached["fetched_at"] > ttl:
+        path.unlink(missing_ok=True)
+        return None
+    return pd.DataFrame(cached["data"], columns=cached["columns"])
+
+
+def _prune_expired_windows(endpoint_name, season):
+    """Delete the season's expired recent windows (they are never requested again)."""
+    prefix = f"{endpoint_name}_{season}_"
+    for path in Path(CACHE_DIR).glob(f"{prefix}*.json.gz"):
+        date_to = path.name[len(prefix):-len(".json.gz")].rsplit("_", 1)[-1]
+        ttl = _cache_ttl(season, None if date_to == "end" else date_to)
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            path.unlink(missing_ok=True)
+
+
+def _write_cached_response(path, df):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"fetched_at": time.time(), "columns": list(df.columns), "data": df.values.tolist()}
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def fetch_all_games_for_season(season=CURRENT_SEASON, date_from=None, date_to=None, endpoint=None, use_cache=True):
     """
     Fetch ALL player games for a season in ONE API call.
     This is much faster than fetching individual player game logs.
+    Responses are served from the on-disk cache in CACHE_DIR when still valid.
     
     Args:
         season: Season string (e.g., '2025-26')
+        date_from: Optional first game date to request (inclusive)
+        date_to: Optional last game date to request (inclusive)
+        endpoint: LeagueGameLog-compatible class (default: GAMELOG_ENDPOINT)
+        use_cache: Read and write the response cache
     
     Returns:
-        DataFrame with all player games for the season
+        DataFrame with all player games for the season (or the date window)
     """
-    print(f"  Fetching all games for season {season} (single API call)...")
+    endpoint = endpoint or GAMELOG_ENDPOINT
+    if date_from or date_to:
+        window = f"{date_from or 'season start'} to {date_to or 'today'}"
+        print(f"  Fetching games for season {season} from {window} (single API call)...")
+    else:
+        print(f"  Fetching all games for season {season} (single API call)...")
+
+    cache_path = _cache_path(endpoint.__name__, season, date_from, date_to)
+    if use_cache:
+        df = _read_cached_response(cache_path, _cache_ttl(season, date_to))
+        if df is not None:
+            print(f"    Retrieved {len(df)} player stat lines (cached)")
+            return df
+
     try:
         time.sleep(REQUEST_DELAY)
         
-        gamelog = leaguegamelog.LeagueGameLog(
+        gamelog = endpoint(
             season=season,
             season_type_all_star='Regular Season',
-            player_or_team_abbreviation='P'  # P = Player stats
+            player_or_team_abbreviation='P',  # P = Player stats
+            date_from_nullable=_api_date(date_from) if date_from else '',
+            date_to_nullable=_api_date(date_to) if date_to else ''
         )
         df = gamelog.get_data_frames()[0]
-        
         if df.empty:
+            # Not cached: an empty (or throttled) window may have games on the next request
             print("    No games found")
             return pd.DataFrame()
         
+        if use_cache:
+            _write_cached_response(cache_path, df)
+            _prune_expired_windows(endpoint.__name__, season)
+        
         print(f"    Retrieved {len(df)} player stat lines")
         return df
         
@@ -52,6 +147,20 @@ def fetch_all_games_for_season(season=CURRENT_SEASON):
         return pd.DataFrame()
 
 
+def _partition_unique(values, sep):
+    """
+    str.partition over a column, evaluated once per distinct value.
+    Returns (before, found, after) arrays aligned with `values`.
+    """
+    codes, uniques = pd.factorize(values.astype(str))
+    parts = pd.Series(uniques, dtype=object).str.partition(sep)
+    return (
+        parts[0].to_numpy(dtype=object)[codes],
+        (parts[1] != '').to_numpy()[codes],
+        parts[2].to_numpy(dtype=object)[codes],
+    )
+
+
 def format_to_pipeline_structure(df):
     """
     Convert NBA API LeagueGameLog format to match PlayerStatistics.csv structure.
@@ -65,69 +174,62 @@ def format_to_pipeline_structure(df):
     if df.empty:
         return df
     
-    records = []
-    for _, row in df.iterrows():
-        # Parse player name
-        player_name = row['PLAYER_NAME']
-        name_parts = player_name.split(' ', 1)
-        first_name = name_parts[0]
-        last_name = name_parts[1] if len(name_parts) > 1 else ''
-        
-        # Parse matchup to get team and opponent
-        matchup = row['MATCHUP']
-        if ' vs. ' in matchup:
-            parts = matchup.split(' vs. ')
-            team = parts[0]
-            opponent = parts[1]
-        elif ' @ ' in matchup:
-            parts = matchup.split(' @ ')
-            team = parts[0]
-            opponent = parts[1]
-        else:
-            team = row.get('TEAM_ABBREVIATION', 'UNK')
-            opponent = 'UNK'
-        
-        # Create record matching PlayerStatistics.csv format
-        record = {
-            'personId': int(row['PLAYER_ID']),
-            'firstName': first_name,
-            'lastName': last_name,
-            'gameDateTimeEst': pd.to_datetime(row['GAME_DATE']),
-            'playerteamName': team,
-            'opponentteamName': opponent,
-            'points': int(row['PTS']) if pd.notna(row['PTS']) else 0,
-            'assists': int(row['AST']) if pd.notna(row['AST']) else 0,
-            'reboundsTotal': int(row['REB']) if pd.notna(row['REB']) else 0,
-            'blocks': int(row['BLK']) if pd.notna(row['BLK']) else 0,
-            'steals': int(row['STL']) if pd.notna(row['STL']) else 0,
-        }
-        records.append(record)
-    
-    return pd.DataFrame(records)
-
-
-def fetch_games_since_date(start_date, end_date=None, season=CURRENT_SEASON):
+    # Parse player names: first word is the first name, the rest the last name
+    first_name, _, last_name = _partition_unique(df['PLAYER_NAME'], ' ')
+    
+    # Parse matchups ("DEN vs. LAL" / "DEN @ LAL") to get team and opponent
+    home_team, is_home, home_opponent = _partition_unique(df['MATCHUP'], ' vs. ')
+    away_team, is_away, away_opponent = _partition_unique(df['MATCHUP'], ' @ ')
+    is_away &= ~is_home
+    fallback_team = df['TEAM_ABBREVIATION'].to_numpy() if 'TEAM_ABBREVIATION' in df.columns else 'UNK'
+    team = np.where(is_home, home_team, np.where(is_away, away_team, fallback_team))
+    opponent = np.where(is_home, home_opponent, np.where(is_away, away_opponent, 'UNK'))
+    
+    def stat(col):
+        return pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int).to_numpy()
+    
+    # Build columns matching PlayerStatistics.csv format
+    return pd.DataFrame({
+        'personId': df['PLAYER_ID'].astype(int).to_numpy(),
+        'gameId': df['GAME_ID'].astype(int).to_numpy(),
+        'firstName': first_name,
+        'lastName': last_name,
+        'gameDateTimeEst': pd.to_datetime(df['GAME_DATE']).to_numpy(),
+        'playerteamName': team,
+        'opponentteamName': opponent,
+        'points': stat('PTS'),
+        'assists': stat('AST'),
+        'reboundsTotal': stat('REB'),
+        'blocks': stat('BLK'),
+        'steals': stat('STL'),
+    })
+
+
+def fetch_games_since_date(start_date, end_date=None, season=CURRENT_SEASON, full_season=False):
     """
     Fetch all player games from start_date to end_date.
-    OPTIMIZED: Uses single API call to get all games, then filters by date.
+    OPTIMIZED: Requests only that date window from the endpoint, so transfer
+    and formatting scale with the number of new games. Advances the season's
+    high-water mark to the latest game returned.
     
     Args:
         start_date: datetime or string in YYYY-MM-DD format
         end_date: datetime or string in YYYY-MM-DD format (default: today)
         season: NBA season string (e.g., '2025-26')
+        full_season: Pull the whole season and filter locally (reconciliation runs)
     
     Returns:
         DataFrame with columns matching PlayerStatistics.csv format
     """
-    if isinstance(start_date, str):
-        min_date = pd.to_datetime(start_date)
-    else:
-        min_date = pd.to_datetime(start_date)
+    min_date = pd.to_datetime(start_date)
     
     print(f"Fetching NBA API data since {min_date.date()} for season {season}...")
     
-    # Fetch all games for the season in one call
-    raw_df = fetch_all_games_for_season(season)
+    if full_season:
+        # Reconciliation: fetch all games for the season in one call
+        raw_df = fetch_all_games_for_season(season)
+    else:
+        raw_df = fetch_all_games_for_season(season, date_from=min_date.strftime('%Y-%m-%d'), date_to=end_date)
     
     if raw_df.empty:
         print("No games found")
@@ -138,6 +240,8 @@ def fetch_games_since_date(start_date, end_date=None, season=CURRENT_SEASON):
     
     # Filter by date
     df = df[df['gameDateTimeEst'] >= min_date]
+    if end_date is not None:
+        df = df[df['gameDateTimeEst'] < pd.to_datetime(end_date) + timedelta(days=1)]
     
     # Remove duplicates (same player, same date)
     df = df.drop_duplicates(subset=['personId', 'gameDateTimeEst'], keep='first')
@@ -0,0 +1,291 @@
+"""
+Batch rendering of the radar charts (one per Uniqorn game).
+
+Every chart is drawn from its five bin values and title. Its output file is
+keyed on a hash of (bin values, title, STYLE_VERSION) recorded in
+radar_chart_manifest.json, so a chart whose file exists with the same key
+is never rendered again; bump STYLE_VERSION when the styling changes.
+Charts that do need rendering are fanned out over a pool of worker
+processes, each of which starts its Kaleido renderer once and keeps it
+warm for every chart it draws.
+
+Two backends draw the same styled chart: "plotly" (Plotly + Kaleido, which
+drives a headless Chrome) and "pillow", which draws the spokes, grid and
+polygon directly with Pillow with no external process. Pillow charts are
+drawn at the 700x700 display size (PILLOW_SCALE); one takes about 26 ms on
+one core, most of it the PNG encode. CHART_BACKEND is the default; the
+UNIQORN_CHART_BACKEND environment variable picks the backend per run. The
+backend is part of the chart key, so switching re-renders every chart once.
+"""
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from data_utils import BUCKET_SHAPE
+
+STYLE_VERSION = 2
+CHART_BACKEND = "plotly"  # "plotly" (Kaleido) or "pillow"
+CHART_BACKEND_ENV = "UNIQORN_CHART_BACKEND"
+CHART_MANIFEST = "radar_chart_manifest.json"
+CHART_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+MAX_RETRIES = 3
+
+WIDTH = 700
+HEIGHT = 700
+SCALE = 2
+PILLOW_SCALE = 1  # Display size; at 2x the PNG encode alone takes ~70 ms
+
+LABELS = ["PTS", "AST", "REB", "BLK", "STL"]
+ACCENT = "rgb(56, 189, 248)"
+
+# Pillow backend: the plotly_dark colors of the chart, in RGBA
+ACCENT_RGBA = (56, 189, 248, 255)
+FILL_RGBA = (56, 189, 248, 51)
+TITLE_RGBA = (224, 242, 254, 255)
+TICK_RGBA = (228, 228, 231, 255)
+GRID_RGBA = (80, 103, 132, 255)
+FONT_FILE = "DejaVuSans.ttf"
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def chart_backend() -> str:
+    """This run's backend: UNIQORN_CHART_BACKEND if set, else CHART_BACKEND."""
+    return os.environ.get(CHART_BACKEND_ENV) or CHART_BACKEND
+
+
+def resolve_backend(backend: str) -> str:
+    """The backend to use for a run: `backend`, or plotly if Pillow is not installed."""
+    if backend not in ("plotly", "pillow"):
+        raise ValueError(f"Unknown chart backend: {backend}")
+    if backend == "pillow" and not pillow_available():
+        print("⚠️ Pillow not installed, rendering charts with plotly")
+        return "plotly"
+    return backend
+
+
+def chart_key(title: str, values, backend: str = CHART_BACKEND) -> str:
+    """Hash of everything that changes a chart's pixels."""
+    payload = json.dumps([[int(v) for v in values], title, STYLE_VERSION, backend])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def radar_figure(title: str, values):
+    """The styled radar chart of one game's bin values (PTS, AST, REB, BLK, STL order)."""
+    import plotly.graph_objects as go
+
+    values = [int(v) for v in values]
+    fig = go.Figure(
+        data=[
+            go.Scatterpolar(
+                r=values + [values[0]],
+                theta=LABELS + [LABELS[0]],
+                fill="toself",
+                fillcolor="rgba(56, 189, 248, 0.20)",
+                line=dict(color=ACCENT, width=3),
+                marker=dict(color=ACCENT, size=6),
+            )
+        ]
+    )
+    fig.update_layout(
+        template="plotly_dark",
+        title=dict(text=title, x=0.5, xanchor="center", font=dict(size=14, color="rgba(224, 242, 254, 1)")),
+        margin=dict(l=40, r=40, t=70, b=40),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        polar=dict(
+            bgcolor="rgba(0,0,0,0)",
+            radialaxis=dict(range=[0, max(BUCKET_SHAPE) - 1], showticklabels=True, tickfont=dict(color="rgba(228,228,231,1)")),
+            angularaxis=dict(tickfont=dict(color="rgba(224,242,254,1)")),
+        ),
+        showlegend=False,
+    )
+    return fig
+
+
+def start_renderer(backend: str = CHART_BACKEND):
+    """
+    Start a persistent Kaleido renderer for this process (Kaleido 1.x; older
+    versions keep one anyway). A one-off warm-up render runs first, since
+    requests to a server whose browser failed to start would block forever.
+    """
+    if backend != "plotly":
+        return
+    try:
+        import kaleido
+    except ImportError:
+        return
+    if not hasattr(kaleido, "start_sync_server"):
+        return
+    try:
+        radar_figure("", [0] * len(LABELS)).to_image(format="png", width=100, height=100)
+    except Exception as e:
+        print(f"⚠️  Chart renderer unavailable, rendering one-off: {str(e).strip().splitlines()[0]}")
+        return
+    kaleido.start_sync_server(silence_warnings=True)
+
+
+def _font(size: int):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(FONT_FILE, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def _render_pillow(out_path: str, title: str, values):
+    """
+    Draw the radar chart with Pillow, laid out like the Plotly figure, at
+    PILLOW_SCALE times the layout size. Only the text is antialiased;
+    ImageDraw lines and polygon edges are not.
+    """
+    from PIL import Image, ImageDraw
+
+    px = PILLOW_SCALE
+    width, height = WIDTH * px, HEIGHT * px
+    max_bucket = max(BUCKET_SHAPE) - 1
+
+    # Plot area inside the figure margins (l=40, r=40, t=70, b=40), leaving room for the axis labels
+    left, right, top, bottom = 40 * px, width - 40 * px, 70 * px, height - 40 * px
+    cx, cy = (left + right) / 2, (top + bottom) / 2
+    radius = min(right - left, bottom - top) / 2 - 30 * px
+
+    # Categories run counterclockwise from 3 o'clock, like Plotly's angular axis
+    angles = [2 * math.pi * i / len(LABELS) for i in range(len(LABELS))]
+
+    def point(r, angle):
+        scaled = radius * r / max_bucket
+        return cx + scaled * math.cos(angle), cy - scaled * math.sin(angle)
+
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image, "RGBA")  # Blends the translucent fill onto what is below it
+    tick_font = _font(12 * px)
+
+    for tick in range(2, max_bucket + 1, 2):
+        r = radius * tick / max_bucket
+        draw.ellipse((cx - r, cy - r, cx + r, cy + r), outline=GRID_RGBA, width=px)
+    for angle in angles:
+        draw.line([(cx, cy), point(max_bucket, angle)], fill=GRID_RGBA, width=px)
+    for label, angle in zip(LABELS, angles):
+        x, y = point(max_bucket, angle)
+        offset = 12 * px
+        draw.text(
+            (x + offset * math.cos(angle), y - offset * math.sin(angle)),
+            label,
+            font=tick_font,
+            fill=TITLE_RGBA,
+            anchor="lm" if math.cos(angle) > 0.1 else "rm" if math.cos(angle) < -0.1 else "mm",
+        )
+
+    polygon = [point(min(max(int(v), 0), max_bucket), angle) for v, angle in zip(values, angles)]
+    draw.polygon(polygon, fill=FILL_RGBA)
+    draw.line(polygon + [polygon[0]], fill=ACCENT_RGBA, width=3 * px, joint="curve")
+    marker = 3 * px
+    for x, y in polygon:
+        draw.ellipse((x - marker, y - marker, x + marker, y + marker), fill=ACCENT_RGBA)
+    for tick in range(0, max_bucket + 1, 2):
+        x, y = point(tick, 0)
+        draw.text((x, y + 4 * px), str(tick), font=tick_font, fill=TICK_RGBA, anchor="mt")
+
+    draw.text((width / 2, 35 * px), title, font=_font(14 * px), fill=TITLE_RGBA, anchor="mm")
+
+    image.save(out_path, format="PNG", compress_level=1)
+
+
+def render_chart(out_path: str, title: str, values, backend: str = CHART_BACKEND) -> bool:
+    """Render one chart to out_path, retrying transient renderer failures."""
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if backend == "pillow":
+        _render_pillow(out_path, title, values)
+        return True
+    fig = radar_figure(title, values)
+    for attempt in range(MAX_RETRIES):
+        try:
+            fig.write_image(out_path, width=WIDTH, height=HEIGHT, scale=SCALE)
+            return True
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1:
+                print(f"Failed to generate chart {os.path.basename(out_path)} after {MAX_RETRIES} attempts: {e}")
+                return False
+            time.sleep(1)
+
+
+def _render_job(job) -> tuple:
+    out_path, title, values, backend = job
+    return out_path, render_chart(out_path, title, values, backend)
+
+
+def _read_manifest(manifest_file) -> dict:
+    if not Path(manifest_file).exists():
+        return {}
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest_file, manifest: dict):
+    tmp_path = Path(f"{manifest_file}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_file)
+
+
+def render_charts(
+    jobs, manifest_file: str = CHART_MANIFEST, workers: int = CHART_WORKERS, backend: str = None
+) -> dict:
+    """
+    Render every (out_path, title, values) job whose file is missing or was
+    drawn from different inputs, with `backend` (default: chart_backend()).
+    Returns the rendered/unchanged/failed counts.
+    """
+    backend = resolve_backend(backend or chart_backend())
+    manifest = _read_manifest(manifest_file)
+    keys = {}
+    pending = []
+    for out_path, title, values in jobs:
+        out_path = str(out_path)
+        keys[out_path] = chart_key(title, values, backend)
+        if manifest.get(out_path) == keys[out_path] and os.path.exists(out_path):
+            continue
+        pending.append((out_path, title, [int(v) for v in values], backend))
+
+    stats = {"rendered": 0, "unchanged": len(keys) - len(pending), "failed": 0}
+    if not pending:
+        print(f"🖼️  All {stats['unchanged']} charts unchanged")
+        return stats
+
+    workers = max(1, min(workers, len(pending)))
+    print(f"🖼️  Rendering {len(pending)} {backend} charts with {workers} worker(s) ({stats['unchanged']} unchanged)...")
+    start = time.time()
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=start_renderer, initargs=(backend,))
+    try:
+        if pool is None:
+            start_renderer(backend)
+            results = map(_render_job, pending)
+        else:
+            results = (future.result() for future in as_completed([pool.submit(_render_job, job) for job in pending]))
+        for out_path, ok in results:
+            if ok:
+                manifest[out_path] = keys[out_path]
+                stats["rendered"] += 1
+            else:
+                manifest.pop(out_path, None)
+                stats["failed"] += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        _write_manifest(manifest_file, manifest)
+
+    elapsed = time.time() - start
+    rate = stats["rendered"] / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Rendered {stats['rendered']} charts in {elapsed:.1f}s ({rate:.1f} charts/sec), {stats['failed']} failed")
+    return stats
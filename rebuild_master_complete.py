@@ -1,6 +1,7 @@
 import subprocess
 import sys
 import os
+import shutil
 
 def rebuild_master():
     """Completely rebuild the master database from scratch."""
@@ -13,6 +14,10 @@ def rebuild_master():
         "master_bucket_summary.json"
     ]
     
+    if os.path.isdir("master_bucket_store"):
+        shutil.rmtree("master_bucket_store")
+        print("🗑️  Deleted master_bucket_store/")
+    
     for file in files_to_delete:
         if os.path.exists(file):
             os.remove(file)
@@ -3,15 +3,16 @@ Regenerate current season data from NBA API.
 Fetches all games from season start through yesterday and merges with master database.
 Use this when you need to catch up on missed games (e.g., after CSV is outdated).
 """
-import json
 import time
-import unicodedata
 from datetime import datetime, timedelta
 from data_utils import create_buckets
+from season_calendar import REGULAR_SEASONS
+from change_log import log_insert
+from master_bucket_store import STORE_DIR, BucketStore, store_exists, store_frame, write_summary
 import nba_api_data
 
 CURRENT_SEASON = "2025-26"
-SEASON_START_DATE = "2025-10-21"  # Update this each season
+SEASON_START_DATE = REGULAR_SEASONS[CURRENT_SEASON][0]
 
 def regenerate_current_season():
     """
@@ -23,32 +24,28 @@ def regenerate_current_season():
     
     # Load master database
     print("📂 Loading master bucket database...")
-    try:
-        with open("master_bucket_database.json", "r") as f:
-            master_data = json.load(f)
-        print(f"   Loaded {len(master_data):,} existing buckets")
-    except FileNotFoundError:
+    if not store_exists(STORE_DIR):
         print("❌ Master database not found! Run master_bucket_precompute.py first")
         return
+    store = BucketStore.load(STORE_DIR)
+    print(f"   Loaded {len(store):,} existing games")
     
     # Calculate date range: season start to yesterday
     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
     print(f"📅 Fetching games from {SEASON_START_DATE} to {yesterday}")
     print(f"   Season: {CURRENT_SEASON}")
     
-    # Fetch from NBA API
+    # Reconciliation run: pull the full season from NBA API
     print("📡 Fetching from NBA API...")
-    new_df = nba_api_data.fetch_games_since_date(start_date=SEASON_START_DATE, season=CURRENT_SEASON)
+    new_df = nba_api_data.fetch_games_since_date(
+        start_date=SEASON_START_DATE, end_date=yesterday, season=CURRENT_SEASON, full_season=True
+    )
     
     if new_df.empty:
         print("❌ No data returned from NBA API")
         return
     
-    print(f"   Retrieved {len(new_df):,} player stat lines")
-    
-    # Filter to current season only
-    new_df = new_df[new_df['gameDateTimeEst'] <= yesterday + ' 23:59:59']
-    print(f"   Filtered to {len(new_df):,} games through {yesterday}")
+    print(f"   Retrieved {len(new_df):,} player stat lines through {yesterday}")
     
     # Create buckets
     print("🔢 Creating buckets...")
@@ -60,89 +57,27 @@ def regenerate_current_season():
     print(f"📊 Processing {len(new_df):,} games...")
     
     # Track statistics
-    games_added = 0
-    games_updated = 0
-    buckets_updated = set()
-    
-    # Determine rebounds column name
-    rebounds_col = 'reboundsTotal' if 'reboundsTotal' in new_df.columns else 'rebounds'
+    new_frame = store_frame(new_df)
     
-    # Process each game
-    for _, new_game in new_df.iterrows():
-        bucket_key = new_game['bucket_key']
-        bucket_str = f"({', '.join(map(str, bucket_key))})"
-        
-        # Create game record with normalized names
-        fn_normalized = unicodedata.normalize('NFD', str(new_game['firstName'])).encode('ascii', 'ignore').decode('utf-8')
-        ln_normalized = unicodedata.normalize('NFD', str(new_game['lastName'])).encode('ascii', 'ignore').decode('utf-8')
-        game_record = {
-            "player": f"{fn_normalized} {ln_normalized}",
-            "date": new_game['gameDateTimeEst'].strftime('%Y-%m-%d'),
-            "stats": f"{int(new_game['points'])}/{int(new_game[rebounds_col])}/{int(new_game['assists'])}/{int(new_game['steals'])}/{int(new_game['blocks'])}",
-            "team": new_game['playerteamName'],
-            "opponent": new_game['opponentteamName'],
-            "season": new_game['season'],
-            "personId": int(new_game['personId'])
-        }
-        
-        # Check if bucket exists
-        if bucket_str not in master_data:
-            # New bucket
-            master_data[bucket_str] = {
-                "count": 1,
-                "games": [game_record]
-            }
-            games_added += 1
-            buckets_updated.add(bucket_str)
-        else:
-            # Existing bucket - check if game already exists
-            existing_games = master_data[bucket_str]['games']
-            game_exists = any(
-                g['player'] == game_record['player'] and 
-                g['date'] == game_record['date'] and
-                g['stats'] == game_record['stats']
-                for g in existing_games
-            )
-            
-            if not game_exists:
-                # Add new game to existing bucket
-                master_data[bucket_str]['games'].insert(0, game_record)
-                master_data[bucket_str]['count'] += 1
-                games_added += 1
-                buckets_updated.add(bucket_str)
-            else:
-                games_updated += 1
+    # Process each game, skipping games already in the database
+    new_rows = store.append_new_games(new_frame)
+    games_added = len(new_rows)
+    games_updated = len(new_frame) - games_added
+    buckets_updated = set(store.columns["bucket"][new_rows].tolist())
     
-    # Save updated master database
+    # Log the changes, then save updated master database
+    log_insert(store, new_rows, STORE_DIR)
     print("💾 Saving updated master database...")
-    with open("master_bucket_database.json", "w") as f:
-        json.dump(master_data, f, indent=2)
+    store.save(STORE_DIR)
     
     # Update summary
     print("📈 Updating summary statistics...")
-    total_games = sum(bucket['count'] for bucket in master_data.values())
-    uniqorn_count = sum(1 for bucket in master_data.values() if bucket['count'] == 1)
-    
-    # Get date range
-    all_dates = []
-    for bucket_info in master_data.values():
-        for game in bucket_info['games']:
-            all_dates.append(game['date'])
-    
-    min_date = min(all_dates) if all_dates else None
-    max_date = max(all_dates) if all_dates else None
-    
-    summary = {
-        "total_games": total_games,
-        "total_buckets": len(master_data),
-        "uniqorn_count": uniqorn_count,
-        "uniqorn_percentage": (uniqorn_count / total_games * 100) if total_games > 0 else 0,
-        "date_range": f"{min_date} to {max_date}",
-        "last_updated": datetime.now().isoformat()
-    }
-    
-    with open("master_bucket_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
+    summary = write_summary(store)
+    total_games = summary["total_games"]
+    total_buckets = summary["total_buckets"]
+    uniqorn_count = summary["uniqorn_count"]
+    min_date = summary["date_range"]["start"]
+    max_date = summary["date_range"]["end"]
     
     duration = time.time() - start_time
     
@@ -153,7 +88,7 @@ def regenerate_current_season():
     print(f"   Games already existed: {games_updated:,}")
     print(f"   Buckets updated: {len(buckets_updated):,}")
     print(f"   Total games in database: {total_games:,}")
-    print(f"   Total buckets: {len(master_data):,}")
+    print(f"   Total buckets: {total_buckets:,}")
     print(f"   Uniqorn games: {uniqorn_count:,}")
     print(f"   Date range: {min_date} to {max_date}")
     print("=" * 60)
@@ -0,0 +1,197 @@
+"""
+Persisted per-(season, player) weighted-uniqueness aggregates.
+
+One row per (season, personId) with the player's name, the game count and
+the sum of the games' weighted-uniqueness scores, saved as one .npy file
+per column under season_aggregates/ with meta.json. The meta records the
+scoring settings and each season's game count in the store; update()
+recomputes only the seasons of the rows inserted or changed since, so the
+nightly cost does not grow with the number of historical seasons. Season leaders and
+career rankings are derived from the table without reading any workbook.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_utils import BIN_EDGES
+from uniqueness_scoring import ALPHA, MIN_GAMES, player_aggregates, store_bucket_codes, weighted_uniqueness
+
+AGGREGATES_DIR = "season_aggregates"
+META_FILE = "meta.json"
+AGGREGATES_VERSION = 1
+
+COLUMNS = ("season", "personId", "player", "games", "score_sum")
+
+
+def _settings(alpha: float) -> dict:
+    """Everything besides the games themselves that changes the scores."""
+    return {
+        "version": AGGREGATES_VERSION,
+        "alpha": alpha,
+        "bin_edges": [[str(edge) for edge in edges] for edges in BIN_EDGES],
+    }
+
+
+def _season_game_counts(store) -> dict:
+    return {season: len(store.season_rows(season)) for season in store.dictionaries["seasons"]}
+
+
+def _split_names(players) -> pd.DataFrame:
+    names = pd.Series(players, dtype=object).str.split(n=1, expand=True)
+    return names.reindex(columns=[0, 1])
+
+
+class SeasonAggregates:
+    """The aggregate table as a DataFrame with COLUMNS, plus the meta it was computed with."""
+
+    def __init__(self, table: pd.DataFrame, settings: dict, season_games: dict):
+        self.table = table
+        self.settings = settings
+        self.season_games = season_games
+
+    @staticmethod
+    def _aggregate(store, rows, alpha: float) -> pd.DataFrame:
+        """
+        Aggregate rows (whole seasons, in date order) per (season, personId).
+        A player is named after their first game of the season.
+        """
+        person_ids = np.asarray(store.columns["personId"][rows], dtype=np.int64)
+        seasons = np.asarray(store.columns["season"][rows], dtype=np.int64)
+        scores = weighted_uniqueness(store_bucket_codes(store, rows), person_ids, seasons, alpha)
+        aggregates = player_aggregates(scores, person_ids, seasons, min_games=0)
+
+        # Same (season, personId) order as player_aggregates
+        _, first = np.unique(np.stack([seasons, person_ids]), axis=1, return_index=True)
+        players = np.asarray(store.columns["player"][rows])[first]
+        return pd.DataFrame({
+            "season": np.asarray(store.dictionaries["seasons"], dtype=object)[aggregates["group"].to_numpy()],
+            "personId": aggregates["personId"].to_numpy(),
+            "player": np.asarray(store.dictionaries["players"], dtype=object)[players],
+            "games": aggregates["games"].to_numpy(),
+            "score_sum": aggregates["score_sum"].to_numpy(),
+        })
+
+    @classmethod
+    def build(cls, store, alpha: float = ALPHA) -> "SeasonAggregates":
+        """Aggregate every season of the store in one pass."""
+        table = cls._aggregate(store, np.asarray(store.indexes.arrays["date_order"]), alpha)
+        table = table.sort_values(["season", "personId", "player"], kind="stable", ignore_index=True)
+        return cls(table, _settings(alpha), _season_game_counts(store))
+
+    def update(self, store, changed_rows=None) -> list:
+        """
+        Recompute the seasons of `changed_rows` (the store rows inserted or
+        changed since the table was computed), plus any season whose game
+        count differs from the meta, which catches updates the table missed.
+        Seasons the store no longer has are dropped. Returns the recomputed
+        seasons.
+        """
+        season_games = _season_game_counts(store)
+        changed = set()
+        if changed_rows is not None and len(changed_rows):
+            codes = np.unique(np.asarray(store.columns["season"][changed_rows]))
+            changed = {store.dictionaries["seasons"][code] for code in codes.tolist()}
+        touched = [s for s, n in season_games.items() if n and (s in changed or self.season_games.get(s) != n)]
+        keep = self.table["season"].isin([s for s, n in season_games.items() if n and s not in touched])
+        if touched:
+            rows = np.concatenate([store.season_rows(season) for season in touched])
+            fresh = self._aggregate(store, rows, self.settings["alpha"])
+            self.table = pd.concat([self.table[keep], fresh], ignore_index=True)
+        else:
+            self.table = self.table[keep].reset_index(drop=True)
+        self.table = self.table.sort_values(["season", "personId", "player"], kind="stable", ignore_index=True)
+        self.season_games = season_games
+        return touched
+
+    def season_leaders(self, min_games: int = MIN_GAMES) -> pd.DataFrame:
+        """Per-season rows in the Uniqorn_Master.xlsx sheet layout, players with at least min_games games."""
+        table = self.table[self.table["games"] >= min_games]
+        names = _split_names(table["player"].to_numpy())
+        return pd.DataFrame({
+            "personId": table["personId"].to_numpy(),
+            "firstName": names[0].to_numpy(),
+            "lastName": names[1].to_numpy(),
+            "season": table["season"].to_numpy(),
+            "games": table["games"].to_numpy(),
+            "avg_weighted_uniqueness": (table["score_sum"] / table["games"]).round(4).to_numpy(),
+        })
+
+    def season_table(self, season: str, min_games: int = MIN_GAMES) -> pd.DataFrame:
+        """One season's leaders, best first."""
+        leaders = self.season_leaders(min_games)
+        leaders = leaders[leaders["season"] == season].sort_values(["personId", "firstName", "lastName"], kind="stable")
+        return leaders.sort_values(by="avg_weighted_uniqueness", ascending=False)
+
+    def career_table(self, limit: int = 50, min_games: int = MIN_GAMES) -> pd.DataFrame:
+        """Career average of the season averages of every qualifying season, best first."""
+        career = (
+            self.season_leaders(min_games)
+            .groupby(["personId", "firstName", "lastName"], as_index=False)["avg_weighted_uniqueness"]
+            .mean()
+        )
+        return career.sort_values("avg_weighted_uniqueness", ascending=False).head(limit).reset_index(drop=True)
+
+    def workbook_sheets(self, min_games: int = MIN_GAMES, career_limit: int = 50) -> dict:
+        """Every sheet of Uniqorn_Master.xlsx: one per season, All_Seasons and AllTimeTop20."""
+        sheets = {}
+        for season in sorted(self.table["season"].unique()):
+            season_df = self.season_table(season, min_games)
+            if not season_df.empty:
+                sheets[season] = season_df
+        seasons_df = pd.concat(sheets.values(), ignore_index=True) if sheets else self.season_leaders(min_games)
+        sheets["All_Seasons"] = seasons_df
+        sheets["AllTimeTop20"] = self.career_table(career_limit, min_games)
+        return sheets
+
+    def save(self, aggregates_dir: str = AGGREGATES_DIR):
+        """Write every column and the meta, replacing files atomically."""
+        path = Path(aggregates_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            values = self.table[name].to_numpy()
+            if values.dtype == object:
+                values = values.astype(str)
+            tmp_path = path / f"{name}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, path / f"{name}.npy")
+        tmp_meta = path / f"{META_FILE}.tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump({"settings": self.settings, "season_games": self.season_games, "rows": len(self.table)}, f)
+        os.replace(tmp_meta, path / META_FILE)
+
+    @classmethod
+    def load(cls, aggregates_dir: str = AGGREGATES_DIR, alpha: float = ALPHA):
+        """Load the table, or return None if it is missing or was computed with other settings."""
+        path = Path(aggregates_dir)
+        if not (path / META_FILE).exists():
+            return None
+        with open(path / META_FILE, "r") as f:
+            meta = json.load(f)
+        if meta["settings"] != _settings(alpha):
+            return None
+        table = pd.DataFrame({name: np.load(path / f"{name}.npy") for name in COLUMNS})
+        for name in ("season", "player"):
+            table[name] = table[name].astype(object)
+        return cls(table, meta["settings"], meta["season_games"])
+
+
+def load_or_build(
+    store, aggregates_dir: str = AGGREGATES_DIR, alpha: float = ALPHA, changed_rows=None
+) -> SeasonAggregates:
+    """
+    Bring the persisted table up to date with the store (building it if
+    needed) and save it. `changed_rows` are the store rows this run inserted
+    or changed; see SeasonAggregates.update.
+    """
+    aggregates = SeasonAggregates.load(aggregates_dir, alpha)
+    if aggregates is None:
+        print(f"🧮 Building season aggregates for {len(store.dictionaries['seasons'])} seasons...")
+        aggregates = SeasonAggregates.build(store, alpha)
+    else:
+        touched = aggregates.update(store, changed_rows)
+        print(f"🧮 Season aggregates: recomputed {', '.join(touched) if touched else 'no seasons'}")
+    aggregates.save(aggregates_dir)
+    return aggregates
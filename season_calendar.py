@@ -0,0 +1,104 @@
+"""
+Regular-season calendar shared by every script.
+
+Season assignment is a vectorized interval lookup: each date is located among
+the sorted season start dates with np.searchsorted and then checked against
+that season's end date. Dates are compared as calendar days, so games played
+on the final day of a season are included.
+"""
+import numpy as np
+import pandas as pd
+
+
+REGULAR_SEASONS = {
+    "1973-74": ("1973-10-09", "1974-03-27"),
+    "1974-75": ("1974-10-17", "1975-04-06"),
+    "1975-76": ("1975-10-23", "1976-04-11"),
+    "1976-77": ("1976-10-21", "1977-04-10"),
+    "1977-78": ("1977-10-18", "1978-04-09"),
+    "1978-79": ("1978-10-12", "1979-04-07"),
+    "1979-80": ("1979-10-12", "1980-04-06"),
+    "1980-81": ("1980-10-10", "1981-04-05"),
+    "1981-82": ("1981-10-09", "1982-04-03"),
+    "1982-83": ("1982-10-08", "1983-04-06"),
+    "1983-84": ("1983-10-11", "1984-04-08"),
+    "1984-85": ("1984-10-12", "1985-04-07"),
+    "1985-86": ("1985-10-25", "1986-04-06"),
+    "1986-87": ("1986-10-31", "1987-04-04"),
+    "1987-88": ("1987-11-06", "1988-04-09"),
+    "1988-89": ("1988-11-04", "1989-04-23"),
+    "1989-90": ("1989-11-03", "1990-04-22"),
+    "1990-91": ("1990-11-02", "1991-04-21"),
+    "1991-92": ("1991-11-01", "1992-04-19"),
+    "1992-93": ("1992-11-06", "1993-04-25"),
+    "1993-94": ("1993-11-05", "1994-04-24"),
+    "1994-95": ("1994-11-04", "1995-04-23"),
+    "1995-96": ("1995-11-03", "1996-04-21"),
+    "1996-97": ("1996-11-01", "1997-04-20"),
+    "1997-98": ("1997-10-31", "1998-04-19"),
+    "1998-99": ("1998-10-30", "1999-04-18"),
+    "1999-00": ("1999-11-02", "2000-04-16"),
+    "2000-01": ("2000-10-31", "2001-04-15"),
+    "2001-02": ("2001-10-30", "2002-04-14"),
+    "2002-03": ("2002-10-29", "2003-04-16"),
+    "2003-04": ("2003-10-28", "2004-04-14"),
+    "2004-05": ("2004-11-02", "2005-04-20"),
+    "2005-06": ("2005-11-01", "2006-04-19"),
+    "2006-07": ("2006-10-31", "2007-04-18"),
+    "2007-08": ("2007-10-30", "2008-04-16"),
+    "2008-09": ("2008-10-28", "2009-04-15"),
+    "2009-10": ("2009-10-27", "2010-04-14"),
+    "2010-11": ("2010-10-26", "2011-04-13"),
+    "2011-12": ("2011-12-25", "2012-04-26"),
+    "2012-13": ("2012-10-30", "2013-04-17"),
+    "2013-14": ("2013-10-29", "2014-04-16"),
+    "2014-15": ("2014-10-28", "2015-04-15"),
+    "2015-16": ("2015-10-27", "2016-04-13"),
+    "2016-17": ("2016-10-25", "2017-04-12"),
+    "2017-18": ("2017-10-17", "2018-04-11"),
+    "2018-19": ("2018-10-16", "2019-04-10"),
+    "2019-20": ("2019-10-22", "2020-03-11"),
+    "2020-21": ("2020-12-22", "2021-05-16"),
+    "2021-22": ("2021-10-19", "2022-04-10"),
+    "2022-23": ("2022-10-18", "2023-04-09"),
+    "2023-24": ("2023-10-24", "2024-04-14"),
+    "2024-25": ("2024-10-22", "2025-04-13"),
+    "2025-26": ("2025-10-21", "2026-04-12"),
+}
+
+SEASONS = list(REGULAR_SEASONS)
+SEASON_STARTS = np.array([start for start, _ in REGULAR_SEASONS.values()], dtype="datetime64[D]")
+SEASON_ENDS = np.array([end for _, end in REGULAR_SEASONS.values()], dtype="datetime64[D]")
+
+# Season labels indexed by season code, with -1 (no season) mapping to None
+_SEASON_LABELS = np.array(SEASONS + [None], dtype=object)
+
+
+def _to_days(dates) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(dates)).to_numpy().astype("datetime64[D]")
+
+
+def season_codes(dates) -> np.ndarray:
+    """Index into SEASONS for every date, or -1 for dates outside all regular seasons."""
+    days = _to_days(dates)
+    codes = np.searchsorted(SEASON_STARTS, days, side="right") - 1
+    in_season = codes >= 0
+    in_season[in_season] = days[in_season] <= SEASON_ENDS[codes[in_season]]
+    codes[~in_season] = -1
+    return codes
+
+
+def assign_seasons(dates):
+    """
+    Season label for every date in one call (None outside the regular season).
+    Returns a Series aligned to `dates` when given a Series, else an object array.
+    """
+    labels = _SEASON_LABELS[season_codes(dates)]
+    if isinstance(dates, pd.Series):
+        return pd.Series(labels, index=dates.index, dtype=object)
+    return labels
+
+
+def season_for_date(date) -> str | None:
+    """Season label for a single date."""
+    return assign_seasons([date])[0]
@@ -0,0 +1,161 @@
+"""
+Parquet cache of the cleaned PlayerStatistics.csv.
+
+The CSV is streamed once through data_utils.iter_csv_chunks (cleaned,
+deduplicated, bucketed), season-assigned and written under
+player_statistics_cache/ with one directory per season:
+
+    player_statistics_cache/season=2024-25/part-00003.parquet
+
+manifest.json records the source file's size, mtime and SHA-256 together
+with the bucket definition and season calendar. The cache is rebuilt only
+when one of those changes. Without pyarrow the loaders fall back to
+streaming the CSV.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from data_utils import BIN_EDGES, iter_csv_chunks
+from season_calendar import REGULAR_SEASONS, assign_seasons
+
+CACHE_DIR = "player_statistics_cache"
+MANIFEST_FILE = "manifest.json"
+CACHE_VERSION = 1  # Bump when the cleaning in iter_csv_chunks changes
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_settings() -> dict:
+    """Everything besides the source file that changes the cached rows."""
+    return {
+        "version": CACHE_VERSION,
+        "bin_edges": [[str(edge) for edge in edges] for edges in BIN_EDGES],
+        "seasons": {season: list(dates) for season, dates in REGULAR_SEASONS.items()},
+    }
+
+
+def _read_manifest(cache_dir):
+    path = Path(cache_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_dir, manifest: dict):
+    path = Path(cache_dir) / MANIFEST_FILE
+    tmp_path = path.with_name(f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def write_season_partition(base_dir, season, part_index, frame):
+    """Write one Parquet part of a season directory (season=YYYY-YY/part-NNNNN.parquet)."""
+    season_dir = Path(base_dir) / f"season={season}"
+    season_dir.mkdir(parents=True, exist_ok=True)
+    path = season_dir / f"part-{part_index:05d}.parquet"
+    tmp_path = path.with_name(f"{path.stem}.tmp.parquet")
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def iter_season_partitions(base_dir, seasons=None):
+    """Yield the Parquet parts under base_dir, season by season and in part order."""
+    for season_dir in sorted(Path(base_dir).glob("season=*")):
+        if seasons is not None and season_dir.name.split("=", 1)[1] not in seasons:
+            continue
+        for part in sorted(season_dir.glob("part-[0-9]*.parquet")):
+            yield pd.read_parquet(part)
+
+
+def cache_is_fresh(input_file="PlayerStatistics.csv", cache_dir=CACHE_DIR) -> bool:
+    """
+    True if the cache was built from the current source file and settings.
+    The file is only hashed when its size or mtime differ from the manifest;
+    if the hash still matches (e.g. the file was copied or touched) the
+    manifest is updated instead of rebuilding.
+    """
+    manifest = _read_manifest(cache_dir)
+    if manifest is None or manifest.get("settings") != _cache_settings():
+        return False
+    stat = os.stat(input_file)
+    source = manifest["source"]
+    if source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if source["size"] != stat.st_size or source["sha256"] != _file_hash(input_file):
+        return False
+    source["mtime_ns"] = stat.st_mtime_ns
+    _write_manifest(cache_dir, manifest)
+    return True
+
+
+def build_cache(input_file="PlayerStatistics.csv", cache_dir=CACHE_DIR):
+    """Rebuild the season-partitioned cache from the CSV, swapping it in when complete."""
+    print(f"🗂️ Building Parquet cache {cache_dir}/ from {input_file}...")
+    stat = os.stat(input_file)
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _file_hash(input_file)}
+
+    tmp_dir = Path(f"{cache_dir}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    rows = 0
+    for i, chunk in enumerate(iter_csv_chunks(input_file)):
+        chunk = chunk.assign(season=assign_seasons(chunk["gameDateTimeEst"])).dropna(subset=["season"])
+        for season, part in chunk.groupby("season", sort=False):
+            write_season_partition(tmp_dir, season, i, part)
+        rows += len(chunk)
+    _write_manifest(tmp_dir, {"settings": _cache_settings(), "source": source, "rows": rows})
+
+    # Swap the finished cache in, so readers never see a partial one
+    old_dir = Path(f"{cache_dir}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if Path(cache_dir).exists():
+        os.replace(cache_dir, old_dir)
+    os.replace(tmp_dir, cache_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    print(f"✅ Cached {rows:,} games")
+
+
+def iter_player_statistics(input_file="PlayerStatistics.csv", seasons=None, cache_dir=CACHE_DIR):
+    """
+    Yield cleaned, bucketed, season-assigned frames, optionally limited to
+    `seasons`. Reads the Parquet cache (rebuilding it first if stale), or
+    streams the CSV when pyarrow is not installed. Rows come out in CSV order
+    within each season.
+    """
+    if not parquet_available():
+        print("⚠️ pyarrow not installed, streaming the CSV without the Parquet cache")
+        for chunk in iter_csv_chunks(input_file):
+            chunk = chunk.assign(season=assign_seasons(chunk["gameDateTimeEst"])).dropna(subset=["season"])
+            if seasons is not None:
+                chunk = chunk[chunk["season"].isin(seasons)]
+            if len(chunk):
+                yield chunk
+        return
+
+    if not cache_is_fresh(input_file, cache_dir):
+        build_cache(input_file, cache_dir)
+    yield from iter_season_partitions(cache_dir, seasons)
+
+
+def load_player_statistics(input_file="PlayerStatistics.csv", seasons=None, cache_dir=CACHE_DIR) -> pd.DataFrame:
+    """Whole-frame version of iter_player_statistics."""
+    frames = list(iter_player_statistics(input_file, seasons, cache_dir))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,96 @@
+"""Backfill against a local stand-in for stats.nba.com/stats/leaguegamelog."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("nba_api")
+
+import nba_api_backfill  # noqa: E402
+from season_calendar import REGULAR_SEASONS  # noqa: E402
+
+HEADERS = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE", "MATCHUP", "PTS", "REB", "AST", "STL", "BLK"]
+GAMES_PER_SEASON = 20
+
+
+def _season_rows(season):
+    days = pd.date_range(*REGULAR_SEASONS[season]).strftime("%Y-%m-%d")
+    return [
+        [i, f"Player {i}", "DEN", f"{season[:4]}{i:05d}", days[i], "DEN vs. LAL", 10 + i, 5, 3, 1, 1]
+        for i in range(GAMES_PER_SEASON)
+    ]
+
+
+class StandInServer:
+    """Serves canned resultSets. `throttled[season]` requests answer 429 first; `empty` seasons have no rows."""
+
+    def __init__(self, throttled=None, empty=()):
+        self.throttled = dict(throttled or {})
+        self.empty = set(empty)
+        self.hits = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                season = parse_qs(urlparse(self.path).query)["Season"][0]
+                server.hits[season] = server.hits.get(season, 0) + 1
+                if server.hits[season] <= server.throttled.get(season, 0):
+                    self.send_response(429)
+                    self.end_headers()
+                    return
+                rows = [] if season in server.empty else _season_rows(season)
+                body = json.dumps({"resultSets": [{"name": "LeagueGameLog", "headers": HEADERS, "rowSet": rows}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fast_limits(monkeypatch):
+    monkeypatch.setattr(nba_api_backfill, "REQUESTS_PER_SECOND", 100)
+    monkeypatch.setattr(nba_api_backfill, "BACKOFF_SECONDS", 0.01)
+
+
+def _completed(backfill_dir):
+    with open(backfill_dir / nba_api_backfill.PROGRESS_FILE) as f:
+        return set(json.load(f)["completed"])
+
+
+def test_retries_resume_and_empty_seasons(tmp_path, fast_limits):
+    seasons = ["2017-18", "2018-19", "2019-20"]
+    server = StandInServer(throttled={"2018-19": 2}, empty={"2019-20"})
+    try:
+        nba_api_backfill.backfill(seasons, workers=2, base_url=server.url, backfill_dir=tmp_path)
+
+        # The throttled season succeeded after its two 429s were retried
+        assert server.hits["2018-19"] == 3
+        # The empty season is reported as failed, not completed
+        assert _completed(tmp_path) == {"2017-18", "2018-19"}
+
+        frames = list(nba_api_backfill.iter_backfilled_statistics(backfill_dir=tmp_path))
+        df = pd.concat(frames, ignore_index=True)
+        assert df.groupby("season").size().to_dict() == {"2017-18": GAMES_PER_SEASON, "2018-19": GAMES_PER_SEASON}
+
+        # Resume: only the unfinished season is requested again, and it completes once it has games
+        server.empty.clear()
+        nba_api_backfill.backfill(seasons, workers=2, base_url=server.url, backfill_dir=tmp_path)
+        assert server.hits == {"2017-18": 1, "2018-19": 3, "2019-20": 2}
+        assert _completed(tmp_path) == set(seasons)
+    finally:
+        server.close()
@@ -0,0 +1,98 @@
+"""Response cache of nba_api_data.fetch_all_games_for_season, with a stand-in endpoint."""
+import gzip
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("nba_api")
+
+import nba_api_data  # noqa: E402
+
+
+class LeagueGameLog:
+    """Stand-in for leaguegamelog.LeagueGameLog; counts calls and serves `frame`."""
+
+    calls = []
+    frame = pd.DataFrame({"PLAYER_ID": [1, 2], "GAME_DATE": ["2019-10-22", "2019-10-23"], "PTS": [30, 12]})
+
+    def __init__(self, **kwargs):
+        LeagueGameLog.calls.append(kwargs)
+
+    def get_data_frames(self):
+        return [LeagueGameLog.frame.copy()]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(nba_api_data, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(nba_api_data, "REQUEST_DELAY", 0)
+    monkeypatch.setattr(LeagueGameLog, "calls", [])
+    return tmp_path
+
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def _expire(path, seconds):
+    """Age a cache entry (its fetched_at and mtime) by `seconds`."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    payload["fetched_at"] -= seconds
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f)
+    _age(path, seconds)
+
+
+def test_completed_window_is_cached_permanently(cache):
+    first = nba_api_data.fetch_all_games_for_season("2019-20", endpoint=LeagueGameLog)
+    path = cache / "LeagueGameLog_2019-20_start_end.json.gz"
+    _expire(path, 365 * 24 * 60 * 60)
+    second = nba_api_data.fetch_all_games_for_season("2019-20", endpoint=LeagueGameLog)
+
+    assert len(LeagueGameLog.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_recent_window_expires_and_is_deleted(cache, monkeypatch):
+    monkeypatch.setitem(nba_api_data.REGULAR_SEASONS, "2099-00", ("2000-01-01", "2100-01-01"))
+    nba_api_data.fetch_all_games_for_season("2099-00", date_from="2099-01-01", endpoint=LeagueGameLog)
+    nba_api_data.fetch_all_games_for_season("2099-00", date_from="2099-01-01", endpoint=LeagueGameLog)
+    assert len(LeagueGameLog.calls) == 1
+
+    path = cache / "LeagueGameLog_2099-00_2099-01-01_end.json.gz"
+    _expire(path, nba_api_data.RECENT_CACHE_TTL + 60)
+    assert nba_api_data._read_cached_response(path, nba_api_data.RECENT_CACHE_TTL) is None
+    assert not path.exists()
+
+    nba_api_data.fetch_all_games_for_season("2099-00", date_from="2099-01-01", endpoint=LeagueGameLog)
+    assert len(LeagueGameLog.calls) == 2
+
+
+def test_writes_prune_expired_recent_windows(cache, monkeypatch):
+    monkeypatch.setitem(nba_api_data.REGULAR_SEASONS, "2099-00", ("2000-01-01", "2100-01-01"))
+    for day in ("2099-01-01", "2099-01-02"):
+        nba_api_data.fetch_all_games_for_season("2099-00", date_from=day, endpoint=LeagueGameLog)
+        for path in cache.iterdir():
+            _age(path, nba_api_data.RECENT_CACHE_TTL + 60)
+    nba_api_data.fetch_all_games_for_season("2019-20", endpoint=LeagueGameLog)
+    _age(cache / "LeagueGameLog_2019-20_start_end.json.gz", nba_api_data.RECENT_CACHE_TTL + 60)
+
+    nba_api_data.fetch_all_games_for_season("2099-00", date_from="2099-01-03", endpoint=LeagueGameLog)
+
+    assert sorted(p.name for p in cache.iterdir()) == [
+        "LeagueGameLog_2019-20_start_end.json.gz",
+        "LeagueGameLog_2099-00_2099-01-03_end.json.gz",
+    ]
+
+
+def test_empty_responses_are_not_cached(cache, monkeypatch):
+    monkeypatch.setattr(LeagueGameLog, "frame", pd.DataFrame(columns=["PLAYER_ID", "GAME_DATE", "PTS"]))
+    assert nba_api_data.fetch_all_games_for_season("2019-20", endpoint=LeagueGameLog).empty
+    assert list(cache.iterdir()) == []
+    nba_api_data.fetch_all_games_for_season("2019-20", endpoint=LeagueGameLog)
+    assert len(LeagueGameLog.calls) == 2
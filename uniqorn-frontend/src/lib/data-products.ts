@@ -0,0 +1,42 @@
+import { readFile } from 'fs/promises';
+import { join } from 'path';
+
+// JSON data products written by the pipeline next to the Excel outputs
+// (see data_products.py). manifest.json lists each product's sheets and files.
+
+type ProductSheet = { file: string; rows: number };
+
+type Manifest = {
+  products: Record<string, { source: string; sha256: string; sheets: Record<string, ProductSheet> }>;
+};
+
+const PRODUCTS_DIR = join(process.cwd(), 'public', 'data', 'json');
+
+async function readManifest(): Promise<Manifest | null> {
+  try {
+    return JSON.parse(await readFile(join(PRODUCTS_DIR, 'manifest.json'), 'utf-8'));
+  } catch {
+    return null;
+  }
+}
+
+// Sheet names of a product, in workbook order, or null if the product is missing
+export async function getProductSheets(name: string): Promise<string[] | null> {
+  const manifest = await readManifest();
+  const product = manifest?.products?.[name];
+  return product ? Object.keys(product.sheets) : null;
+}
+
+// Rows of one sheet (default: the first) of a product, or null if the product is missing
+export async function readProductSheet<T>(name: string, sheetName?: string): Promise<T[] | null> {
+  const manifest = await readManifest();
+  const product = manifest?.products?.[name];
+  if (!product) return null;
+  const sheet = sheetName ? product.sheets[sheetName] : Object.values(product.sheets)[0];
+  if (!sheet) return [];
+  try {
+    return JSON.parse(await readFile(join(PRODUCTS_DIR, sheet.file), 'utf-8'));
+  } catch {
+    return null;
+  }
+}
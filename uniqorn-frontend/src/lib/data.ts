@@ -1,6 +1,7 @@
 import * as XLSX from 'xlsx';
 import { readFile, writeFile } from 'fs/promises';
-import { join } from 'path';
+import { basename, join } from 'path';
+import { getProductSheets, readProductSheet } from './data-products';
 
 export type LeaderRow = {
   personId: string | number;
@@ -41,7 +42,20 @@ async function readWorkbook(absPath: string): Promise<XLSX.WorkBook> {
   return XLSX.read(bytes, { type: 'buffer' });
 }
 
+// Outputs are read from their JSON data product when it exists, else from the workbook
+function productName(absPath: string): string {
+  return basename(absPath, '.xlsx');
+}
+
+async function readSheetNames(absPath: string): Promise<string[]> {
+  const sheets = await getProductSheets(productName(absPath));
+  if (sheets) return sheets;
+  return (await readWorkbook(absPath)).SheetNames;
+}
+
 async function readWorkbookSheet<T>(absPath: string, sheetName?: string): Promise<T[]> {
+  const rows = await readProductSheet<T>(productName(absPath), sheetName);
+  if (rows) return rows;
   const wb = await readWorkbook(absPath);
   const targetSheetName = sheetName ?? wb.SheetNames[0];
   const ws = wb.Sheets[targetSheetName];
@@ -80,30 +94,27 @@ export async function getMostRecentGameDate(): Promise<string> {
 
 export async function getCurrentSeasonLeaders(limit = 25): Promise<LeaderRow[]> {
   const uniqornXlsx = join(process.cwd(), 'public', 'data', 'Uniqorn_Master.xlsx');
-  const wb = await readWorkbook(uniqornXlsx);
+  const sheetNames = await readSheetNames(uniqornXlsx);
 
-  const seasonSheets = wb.SheetNames.filter((s: string) => s.includes('-') && s !== 'AllTimeTop20');
+  const seasonSheets = sheetNames.filter((s: string) => s.includes('-') && s !== 'AllTimeTop20');
   const latestSeason = seasonSheets.sort().at(-1);
   if (!latestSeason) return [];
 
-  const ws = wb.Sheets[latestSeason];
-  const rows = XLSX.utils.sheet_to_json<LeaderRow>(ws, { defval: null });
+  const rows = await readWorkbookSheet<LeaderRow>(uniqornXlsx, latestSeason);
 
   return rows.slice(0, limit);
 }
 
 export async function getAvailableSeasons(): Promise<string[]> {
   const uniqornXlsx = join(process.cwd(), 'public', 'data', 'Uniqorn_Master.xlsx');
-  const wb = await readWorkbook(uniqornXlsx);
-  return wb.SheetNames.filter((s: string) => s.includes('-') && s !== 'AllTimeTop20').sort();
+  const sheetNames = await readSheetNames(uniqornXlsx);
+  return sheetNames.filter((s: string) => s.includes('-') && s !== 'AllTimeTop20').sort();
 }
 
 export async function getSeasonLeaders(season: string, limit = 50): Promise<LeaderRow[]> {
   const uniqornXlsx = join(process.cwd(), 'public', 'data', 'Uniqorn_Master.xlsx');
-  const wb = await readWorkbook(uniqornXlsx);
-  const ws = wb.Sheets[season];
-  if (!ws) return [];
-  const rows = XLSX.utils.sheet_to_json<LeaderRow>(ws, { defval: null });
+  if (!(await readSheetNames(uniqornXlsx)).includes(season)) return [];
+  const rows = await readWorkbookSheet<LeaderRow>(uniqornXlsx, season);
   return rows.slice(0, limit);
 }
 
@@ -111,14 +122,12 @@ export async function getAllTimeLeaders(limit = 50): Promise<AllTimeRow[]> {
   const uniqornXlsx = join(process.cwd(), 'public', 'data', 'Uniqorn_Master.xlsx');
   
   // Always recalculate to ensure games column is populated correctly
-  const wb = await readWorkbook(uniqornXlsx);
-  const seasonSheets = wb.SheetNames.filter((s: string) => s.includes('-'));
+  const sheetNames = await readSheetNames(uniqornXlsx);
+  const seasonSheets = sheetNames.filter((s: string) => s.includes('-'));
 
   const byPlayer = new Map<string, { personId: string | number; firstName: string; lastName: string; sum: number; count: number; games?: number }>();
   for (const sheetName of seasonSheets) {
-    const ws = wb.Sheets[sheetName];
-    if (!ws) continue;
-    const rows = XLSX.utils.sheet_to_json<LeaderRow>(ws, { defval: null });
+    const rows = await readWorkbookSheet<LeaderRow>(uniqornXlsx, sheetName);
     for (const row of rows) {
       const key = String(row.personId);
       const prev = byPlayer.get(key) ?? {
@@ -183,10 +192,7 @@ export function safeChartFileName(firstName: string, lastName: string, rawDate:
 
 export async function getRecentUniqornGames(limit = 10): Promise<UniqornGameRow[]> {
   const filePath = join(process.cwd(), 'public', 'data', 'CurrentSeason_UniqornGames_Master.xlsx');
-  const fileBuffer = await readFile(filePath);
-  const workbook = XLSX.read(fileBuffer, { type: 'buffer' });
-  const sheet = workbook.Sheets[workbook.SheetNames[0]];
-  const rows = XLSX.utils.sheet_to_json(sheet) as any[];
+  const rows = await readWorkbookSheet<any>(filePath);
 
   const games: UniqornGameRow[] = rows
     .map((row) => ({
@@ -251,10 +257,7 @@ async function getUltimateChanges(): Promise<UltimateChanges> {
 
 export async function getMostRecentUltimateUniqorn() {
   const filePath = join(process.cwd(), 'public', 'data', 'Ultimate_Uniqorn_Games_Master.xlsx');
-  const fileBuffer = await readFile(filePath);
-  const workbook = XLSX.read(fileBuffer, { type: 'buffer' });
-  const sheet = workbook.Sheets[workbook.SheetNames[0]];
-  const rows = XLSX.utils.sheet_to_json(sheet) as any[];
+  const rows = await readWorkbookSheet<any>(filePath);
 
   const mostRecent = rows
     .map((row) => ({
@@ -1,6 +1,7 @@
 import * as XLSX from 'xlsx';
 import { readFile } from 'fs/promises';
 import { join } from 'path';
+import { readProductSheet } from './data-products';
 
 export type UltimateGame = {
   season: string;
@@ -24,11 +25,15 @@ export type PlayerEntry = {
 };
 
 export async function getUltimateData(): Promise<PlayerEntry[]> {
-  const filePath = join(process.cwd(), 'public', 'data', 'Ultimate_Uniqorn_Games_Master.xlsx');
-  const fileBuffer = await readFile(filePath);
-  const workbook = XLSX.read(fileBuffer, { type: 'buffer' });
-  const sheet = workbook.Sheets[workbook.SheetNames[0]];
-  const rows = XLSX.utils.sheet_to_json(sheet) as any[];
+  // JSON data product when available, else the workbook
+  let rows = await readProductSheet<any>('Ultimate_Uniqorn_Games_Master');
+  if (!rows) {
+    const filePath = join(process.cwd(), 'public', 'data', 'Ultimate_Uniqorn_Games_Master.xlsx');
+    const fileBuffer = await readFile(filePath);
+    const workbook = XLSX.read(fileBuffer, { type: 'buffer' });
+    const sheet = workbook.Sheets[workbook.SheetNames[0]];
+    rows = XLSX.utils.sheet_to_json(sheet) as any[];
+  }
 
   const games: UltimateGame[] = rows.map((row) => {
     // Handle both string dates and Excel serial dates
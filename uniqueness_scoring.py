@@ -0,0 +1,87 @@
+"""
+Vectorized weighted-uniqueness scoring shared by the pipeline and the
+seasonal index.
+
+A game scores exp(-ALPHA * effective_count), where effective_count is the
+number of games by *other* players in the same bucket within the same
+group (a season, or the whole history), floored at 1. Games are passed as
+parallel arrays of bucket codes (data_utils bucket code order), personIds
+and optional group codes, so every season can be scored in one pass.
+"""
+import numpy as np
+import pandas as pd
+
+from data_utils import BIN_EDGES, NUM_BUCKETS, bin_values, encode_bucket_bins
+
+ALPHA = 0.10
+MIN_GAMES = 16  # Players need at least this many games in a group to be ranked
+
+
+def store_bucket_codes(store, rows=None) -> np.ndarray:
+    """
+    Bucket codes recomputed from a BucketStore's raw stats with the current
+    BIN_EDGES, so a change of bin edges needs no store rebuild.
+    """
+    columns = ("points", "rebounds", "assists", "steals", "blocks")
+    stats = [store.columns[col] if rows is None else store.columns[col][rows] for col in columns]
+    return encode_bucket_bins([bin_values(values, edges) for values, edges in zip(stats, BIN_EDGES)])
+
+
+def _group_bucket_keys(bucket_codes, groups=None) -> np.ndarray:
+    codes = np.asarray(bucket_codes, dtype=np.int64)
+    if groups is None:
+        return codes
+    return np.asarray(groups, dtype=np.int64) * NUM_BUCKETS + codes
+
+
+def bucket_totals(bucket_codes, groups=None) -> np.ndarray:
+    """For every game, the number of games in its (group, bucket)."""
+    keys = _group_bucket_keys(bucket_codes, groups)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    return counts[inverse]
+
+
+def weighted_uniqueness(bucket_codes, person_ids, groups=None, alpha: float = ALPHA) -> np.ndarray:
+    """Score every game by how many other players' games share its (group, bucket)."""
+    keys = _group_bucket_keys(bucket_codes, groups)
+    if len(keys) == 0:
+        return np.empty(0, dtype=float)
+    _, key_inverse, key_counts = np.unique(keys, return_inverse=True, return_counts=True)
+    _, person_index = np.unique(np.asarray(person_ids, dtype=np.int64), return_inverse=True)
+    own_keys = key_inverse.astype(np.int64) * (person_index.max() + 1) + person_index
+    _, own_inverse, own_counts = np.unique(own_keys, return_inverse=True, return_counts=True)
+    effective = np.maximum(key_counts[key_inverse] - own_counts[own_inverse], 1)
+    return np.exp(-alpha * effective)
+
+
+def bucket_rarity(bucket_codes, groups=None, alpha: float = ALPHA) -> np.ndarray:
+    """Score every game exp(-alpha * (games in its (group, bucket) - 1)), so a Uniqorn scores 1.0."""
+    return np.exp(-alpha * (bucket_totals(bucket_codes, groups) - 1))
+
+
+def player_aggregates(scores, person_ids, groups=None, min_games: int = MIN_GAMES) -> pd.DataFrame:
+    """
+    Per (group, personId) game count, score sum and rounded average score,
+    keeping players with at least `min_games` games. Columns: group,
+    personId, games, score_sum, avg_weighted_uniqueness.
+    """
+    person_ids = np.asarray(person_ids, dtype=np.int64)
+    groups = np.zeros(len(person_ids), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    keys, inverse = np.unique(np.stack([groups, person_ids]), axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    games = np.bincount(inverse, minlength=keys.shape[1])
+    score_sum = np.bincount(inverse, weights=np.asarray(scores, dtype=float), minlength=keys.shape[1])
+    aggregates = pd.DataFrame({
+        "group": keys[0],
+        "personId": keys[1],
+        "games": games,
+        "score_sum": score_sum,
+    })
+    aggregates["avg_weighted_uniqueness"] = (aggregates["score_sum"] / aggregates["games"]).round(4)
+    return aggregates[aggregates["games"] >= min_games].reset_index(drop=True)
+
+
+def score_players(bucket_codes, person_ids, groups=None, alpha: float = ALPHA, min_games: int = MIN_GAMES) -> pd.DataFrame:
+    """weighted_uniqueness followed by player_aggregates, for one group or many at once."""
+    scores = weighted_uniqueness(bucket_codes, person_ids, groups, alpha)
+    return player_aggregates(scores, person_ids, groups, min_games)